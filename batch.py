@@ -0,0 +1,217 @@
+"""
+Пакетное шифрование множества блоков сети Фейстеля с помощью NumPy.
+
+Все раунды выполняются векторными операциями над массивом формы
+(N, block_len), поэтому стоимость интерпретатора не зависит от числа блоков.
+crypt_keys выполняет то же вдоль оси ключей: один открытый текст
+шифруется множеством ключей за один вызов.
+"""
+
+from feistel import keys_gen_bytes, permutation_table
+
+try:
+    import numpy as np
+except ImportError:  # numpy - необязательная зависимость
+    np = None
+
+def _require_numpy():
+    """Проверяет, что numpy доступен"""
+    if np is None:
+        raise ImportError("Для пакетной обработки требуется numpy")
+
+def _key_rows(keys, width):
+    """
+    Собирает ключи раундов в матрицу (rounds, width), дополняя их нулями.
+
+    Args:
+        keys: Список ключей раундов типа bytes
+        width: Ширина строки (длина половины блока)
+
+    Returns:
+        Массив uint8 формы (len(keys), width)
+    """
+    rows = np.zeros((len(keys), width), dtype=np.uint8)
+    for i, round_key in enumerate(keys):
+        rows[i, :len(round_key)] = np.frombuffer(round_key, dtype=np.uint8)
+    return rows
+
+def crypt_blocks(blocks, key, decrypt, rounds, legacy_growth=False):
+    """
+    Шифрует или дешифрует пакет независимых блоков одним ключом.
+
+    Результат для каждой строки совпадает с crypt_block_bytes с теми же
+    параметрами. Ключи раундов вычисляются один раз и транслируются
+    (broadcast) на весь пакет.
+
+    Args:
+        blocks: Массив uint8 формы (N, block_len) или совместимый объект
+        key: Ключ шифрования
+        decrypt: Флаг режима (True для дешифрования, False для шифрования)
+        rounds: Количество раундов шифрования
+        legacy_growth: Флаг совместимости, при котором блок растет, если
+            ключ длиннее половины блока
+
+    Returns:
+        Массив uint8 формы (N, result_len) с результатами
+    """
+    _require_numpy()
+    blocks = np.asarray(blocks, dtype=np.uint8)
+    if blocks.ndim != 2:
+        raise ValueError("Ожидается массив формы (N, block_len)")
+
+    block_len = blocks.shape[1]
+    half = block_len // 2
+    if legacy_growth:
+        keys = keys_gen_bytes(key, decrypt, rounds)
+    elif block_len % 2 != 0:
+        raise ValueError("Длина блока должна быть четной (см. pad_block)")
+    else:
+        keys = keys_gen_bytes(key, decrypt, rounds, half)
+
+    if block_len % 2 == 0 and all(len(k) <= half for k in keys):
+        # Размер блока не меняется: раунды на месте над двумя половинами
+        key_rows = _key_rows(keys, half)
+        left = blocks[:, :half].copy()
+        right = blocks[:, half:].copy()
+        tmp = np.empty_like(left)
+        for key_row in key_rows:
+            # F(right) = bit_left(vec_invert(vec_xor(right, key))); сдвиг
+            # в uint8 сам отбрасывает старший бит
+            np.bitwise_xor(right, key_row, out=tmp)
+            np.invert(tmp, out=tmp)
+            np.left_shift(tmp, 1, out=tmp)
+            np.bitwise_xor(left, tmp, out=left)
+            left, right = right, left
+        # Финальная перестановка
+        return np.concatenate((right, left), axis=1)
+
+    # Общий случай: блок растет, если ключ длиннее правой половины
+    current = blocks.copy()
+    for round_key in keys:
+        half = current.shape[1] // 2
+        left = current[:, :half]
+        right = current[:, half:]
+        out_len = max(right.shape[1], len(round_key))
+
+        new_right = np.zeros((current.shape[0], out_len), dtype=np.uint8)
+        new_right[:, :right.shape[1]] = right
+        new_right ^= _key_rows([round_key], out_len)[0]
+        np.invert(new_right, out=new_right)
+        np.left_shift(new_right, 1, out=new_right)
+        new_right[:, :half] ^= left
+
+        current = np.concatenate((right, new_right), axis=1)
+    half = current.shape[1] // 2
+    return np.concatenate((current[:, half:], current[:, :half]), axis=1)
+
+def key_schedule_rows(keys, decrypt, rounds):
+    """
+    Векторный аналог keys_gen для матрицы ключей одинаковой длины.
+
+    Перестановка ключа раунда i зависит только от длины ключа и i, поэтому
+    она выполняется одной выборкой по permutation_table для всех строк сразу.
+
+    Args:
+        keys: Массив uint8 формы (K, key_len)
+        decrypt: Флаг режима (True для дешифрования, False для шифрования)
+        rounds: Количество раундов шифрования
+
+    Returns:
+        Массив uint8 формы (rounds, K, key_len)
+    """
+    key_len = keys.shape[1]
+    order = range(rounds - 1, -1, -1) if decrypt else range(rounds)
+    schedule = np.empty((rounds, keys.shape[0], key_len), dtype=np.uint8)
+    for row, i in enumerate(order):
+        schedule[row] = keys[:, list(permutation_table(key_len, i))] if key_len else keys
+    return schedule
+
+def fit_key_rows(schedule, length):
+    """
+    Векторный аналог fit_key для ключей раундов формы (rounds, K, key_len).
+
+    Короткие ключи дополняются нулями, длинные сворачиваются XOR по позициям
+    i % length.
+
+    Returns:
+        Массив uint8 формы (rounds, K, length)
+    """
+    key_len = schedule.shape[2]
+    if key_len <= length or length == 0:
+        fitted = np.zeros(schedule.shape[:2] + (length,), dtype=np.uint8)
+        fitted[:, :, :min(key_len, length)] = schedule[:, :, :length]
+        return fitted
+    folds = -(-key_len // length)
+    padded = np.zeros(schedule.shape[:2] + (folds * length,), dtype=np.uint8)
+    padded[:, :, :key_len] = schedule
+    return np.bitwise_xor.reduce(padded.reshape(schedule.shape[:2] + (folds, length)), axis=2)
+
+def crypt_keys(block, keys, decrypt, rounds, legacy_growth=False):
+    """
+    Шифрует или дешифрует один блок множеством ключей одинаковой длины.
+
+    Строка i результата совпадает с crypt_block_bytes(block, keys[i], ...).
+    Расписание ключей и все раунды вычисляются векторно вдоль оси ключей.
+
+    Args:
+        block: Блок данных (bytes-подобный объект) или массив uint8 формы
+            (K, block_len) - свой блок для каждого ключа
+        keys: Массив uint8 формы (K, key_len) или совместимый объект
+        decrypt: Флаг режима (True для дешифрования, False для шифрования)
+        rounds: Количество раундов шифрования
+        legacy_growth: Флаг совместимости, при котором блок растет, если
+            ключ длиннее половины блока
+
+    Returns:
+        Массив uint8 формы (K, result_len) с результатами
+    """
+    _require_numpy()
+    keys = np.asarray(keys, dtype=np.uint8)
+    if keys.ndim != 2:
+        raise ValueError("Ожидается матрица ключей формы (K, key_len)")
+    if isinstance(block, (bytes, bytearray, memoryview)):
+        block = np.frombuffer(bytes(block), dtype=np.uint8)
+    block = np.asarray(block, dtype=np.uint8)
+    blocks = np.broadcast_to(block, (keys.shape[0], block.shape[-1]))
+
+    block_len = blocks.shape[1]
+    half = block_len // 2
+    schedule = key_schedule_rows(keys, decrypt, rounds)
+    if not legacy_growth:
+        if block_len % 2 != 0:
+            raise ValueError("Длина блока должна быть четной (см. pad_block)")
+        schedule = fit_key_rows(schedule, half)
+
+    if block_len % 2 == 0 and schedule.shape[2] <= half:
+        # Размер блока не меняется: раунды на месте над двумя половинами
+        schedule = fit_key_rows(schedule, half)
+        left = blocks[:, :half].copy()
+        right = blocks[:, half:].copy()
+        tmp = np.empty_like(left)
+        for key_rows in schedule:
+            np.bitwise_xor(right, key_rows, out=tmp)
+            np.invert(tmp, out=tmp)
+            np.left_shift(tmp, 1, out=tmp)
+            np.bitwise_xor(left, tmp, out=left)
+            left, right = right, left
+        # Финальная перестановка
+        return np.concatenate((right, left), axis=1)
+
+    # Общий случай: у всех ключей одна длина, поэтому блоки растут одинаково
+    current = blocks.copy()
+    for key_rows in schedule:
+        half = current.shape[1] // 2
+        left = current[:, :half]
+        right = current[:, half:]
+        out_len = max(right.shape[1], key_rows.shape[1])
+
+        new_right = np.zeros((current.shape[0], out_len), dtype=np.uint8)
+        new_right[:, :right.shape[1]] = right
+        new_right[:, :key_rows.shape[1]] ^= key_rows
+        np.invert(new_right, out=new_right)
+        np.left_shift(new_right, 1, out=new_right)
+        new_right[:, :half] ^= left
+
+        current = np.concatenate((right, new_right), axis=1)
+    half = current.shape[1] // 2
+    return np.concatenate((current[:, half:], current[:, :half]), axis=1)
@@ -0,0 +1,335 @@
+"""
+Набор тестов производительности ядра сети Фейстеля.
+
+Измеряет пропускную способность (байт/с) и время одного вызова
+crypt_block (для каждого движка), crypt_round, f и keys_gen на сетке
+размеров блока, длин ключа и числа раундов (типичные значения 1-20;
+rounds_input GUI допускает до MAX_ROUNDS = 10000 раундов).
+Результаты сохраняются в JSON; при передаче --compare результаты
+сравниваются с предыдущим запуском и регрессии выводятся отдельно.
+Кроме того, измеряется время импорта ядра (пакет feistel) в отдельном
+процессе: оно не должно превышать --import-budget, а Qt не должен
+загружаться. С --parallel измеряется ускорение ParallelCipher при росте
+числа рабочих процессов (в идеале - линейное).
+
+Примеры:
+    python bench.py -o results.json
+    python bench.py --quick --compare results.json
+    python bench.py --quick --parallel
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+
+from feistel import ENGINES, crypt_block, crypt_round, f, keys_gen
+
+BLOCK_SIZES = (16, 256, 4096)
+KEY_LENGTHS = (4, 8, 32)
+# Стоимость crypt_block линейна по числу раундов, поэтому сетка ограничена
+# типичными значениями, а не всем диапазоном rounds_input (до 10000)
+ROUNDS = (1, 5, 10, 20)
+
+QUICK_BLOCK_SIZES = (16, 256)
+QUICK_KEY_LENGTHS = (8,)
+QUICK_ROUNDS = (1, 10)
+
+# Минимальная длительность одного замера в секундах
+MIN_TIME = 0.05
+
+# Число повторов замера; в результат идет лучший
+REPEAT = 3
+
+# Допустимое время импорта ядра в секундах
+IMPORT_BUDGET = 0.05
+
+# Модуль ядра, время импорта которого измеряется
+CORE_MODULE = 'feistel'
+
+# Размер сообщения для замера масштабирования ParallelCipher
+PARALLEL_SIZE = 8 << 20
+
+def random_bytes(rng, length):
+    """Возвращает воспроизводимый список случайных байтов"""
+    return [rng.randrange(256) for _ in range(length)]
+
+def measure(func, min_time=MIN_TIME, repeat=REPEAT):
+    """
+    Измеряет время одного вызова func.
+
+    Args:
+        func: Функция без аргументов
+        min_time: Минимальная длительность одного замера
+        repeat: Число повторов замера
+
+    Returns:
+        Кортеж (число вызовов в замере, лучшее время одного вызова в секундах)
+    """
+    timer = timeit.Timer(func)
+    calls = 1
+    while True:
+        elapsed = timer.timeit(calls)
+        if elapsed >= min_time:
+            break
+        calls *= 2 if elapsed * 10 > min_time else 10
+    best = min([elapsed] + timer.repeat(repeat - 1, calls))
+    return calls, best / calls
+
+def record(name, params, nbytes, calls, per_call, rounds=None):
+    """Формирует запись результата одного замера"""
+    entry = {
+        'name': name,
+        **params,
+        'calls': calls,
+        'seconds_per_call': per_call,
+        'bytes_per_sec': nbytes / per_call if per_call else None,
+    }
+    if rounds:
+        entry['seconds_per_round'] = per_call / rounds
+    return entry
+
+def run_benchmarks(block_sizes=BLOCK_SIZES, key_lengths=KEY_LENGTHS, rounds_grid=ROUNDS,
+                   engines=None, seed=0, min_time=MIN_TIME, repeat=REPEAT, log=None):
+    """
+    Выполняет замеры на заданной сетке параметров.
+
+    Args:
+        block_sizes: Размеры блока в байтах
+        key_lengths: Длины ключа в байтах
+        rounds_grid: Количества раундов для crypt_block и keys_gen
+        engines: Имена движков для crypt_block (по умолчанию все из ENGINES)
+        seed: Начальное значение генератора данных
+        min_time: Минимальная длительность одного замера
+        repeat: Число повторов замера
+        log: Файловый объект для вывода прогресса или None
+
+    Returns:
+        Список записей результатов
+    """
+    rng = random.Random(seed)
+    engines = sorted(ENGINES) if engines is None else engines
+    results = []
+
+    def add(entry):
+        results.append(entry)
+        if log:
+            params = ' '.join(f"{k}={v}" for k, v in entry.items()
+                              if k not in ('name', 'calls', 'seconds_per_call',
+                                           'bytes_per_sec', 'seconds_per_round'))
+            log.write(f"{entry['name']:<12} {params:<50} "
+                      f"{entry['seconds_per_call'] * 1e6:12.2f} мкс/вызов\n")
+
+    for key_len in key_lengths:
+        key = random_bytes(rng, key_len)
+        for rounds in rounds_grid:
+            calls, per_call = measure(lambda: keys_gen(key, False, rounds), min_time, repeat)
+            add(record('keys_gen', {'key_len': key_len, 'rounds': rounds},
+                       key_len * rounds, calls, per_call))
+
+    for block_size in block_sizes:
+        block = random_bytes(rng, block_size)
+        half = block_size // 2
+        for key_len in key_lengths:
+            key = random_bytes(rng, key_len)
+            params = {'block_size': block_size, 'key_len': key_len}
+
+            calls, per_call = measure(lambda: f(block[half:], key), min_time, repeat)
+            add(record('f', params, block_size - half, calls, per_call))
+
+            calls, per_call = measure(lambda: crypt_round(block, key), min_time, repeat)
+            add(record('crypt_round', params, block_size, calls, per_call))
+
+            for rounds in rounds_grid:
+                for engine in engines:
+                    calls, per_call = measure(
+                        lambda: crypt_block(block, key, False, rounds, engine),
+                        min_time, repeat)
+                    add(record('crypt_block', {**params, 'rounds': rounds, 'engine': engine},
+                               block_size, calls, per_call, rounds))
+    return results
+
+def measure_import(module=CORE_MODULE, repeat=REPEAT):
+    """
+    Измеряет время импорта модуля в новом процессе через python -X importtime.
+
+    Args:
+        module: Имя импортируемого модуля
+        repeat: Число запусков; в результат идет лучший
+
+    Returns:
+        Запись результата с полями seconds_per_call (None, если время не
+        найдено в выводе -X importtime) и qt_loaded
+    """
+    code = (f"import sys, {module}; "
+            "print(any(name.startswith('PyQt') for name in sys.modules))")
+    best = None
+    for _ in range(repeat):
+        # Пакет импортируется из каталога репозитория, а не из текущего
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+        for line in proc.stderr.splitlines():
+            # Формат строки: "import time: self [us] | cumulative | имя модуля"
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                elapsed = int(fields[1]) / 1e6
+                best = elapsed if best is None else min(best, elapsed)
+        qt_loaded = proc.stdout.strip() == 'True'
+    return {
+        'name': 'import',
+        'module': module,
+        'calls': 1,
+        'seconds_per_call': best,
+        'bytes_per_sec': None,
+        'qt_loaded': qt_loaded,
+    }
+
+def measure_parallel(size=PARALLEL_SIZE, workers_grid=None, mode='ctr', rounds=10,
+                     engine='int', repeat=REPEAT, log=None):
+    """
+    Измеряет масштабирование ParallelCipher по числу рабочих процессов.
+    
+    Args:
+        size: Размер сообщения в байтах
+        workers_grid: Числа процессов (по умолчанию степени двойки до os.cpu_count())
+        mode: Режим из MODES
+        rounds: Количество раундов шифрования
+        engine: Имя движка из ENGINES
+        repeat: Число повторов замера; в результат идет лучший
+        log: Файловый объект для вывода прогресса или None
+    
+    Returns:
+        Список записей с полем speedup - ускорением относительно одного процесса
+    """
+    # Пул процессов нужен только для этого замера
+    from parallel import ParallelCipher
+    
+    if workers_grid is None:
+        cpus = os.cpu_count() or 1
+        workers_grid = sorted({1, cpus} | {1 << i for i in range(cpus.bit_length())
+                                           if 1 << i <= cpus})
+    data = random.Random(0).randbytes(size)
+    results = []
+    for workers in workers_grid:
+        with ParallelCipher(b'nezachet', rounds, engine=engine, workers=workers) as cipher:
+            best = min(timeit.repeat(lambda: cipher.encrypt(data, mode), number=1,
+                                     repeat=repeat))
+        entry = record('parallel', {'mode': mode, 'engine': engine, 'rounds': rounds,
+                                    'size': size, 'workers': workers}, size, 1, best)
+        entry['speedup'] = results[0]['seconds_per_call'] / best if results else 1.0
+        results.append(entry)
+        if log:
+            log.write(f"parallel     workers={workers:<3} {size / best / 1e6:10.2f} МБ/с "
+                      f"ускорение {entry['speedup']:.2f} (идеал {workers})\n")
+    return results
+
+def result_key(entry):
+    """Ключ записи для сопоставления результатов разных запусков"""
+    return tuple(sorted((k, v) for k, v in entry.items()
+                        if k not in ('calls', 'seconds_per_call', 'bytes_per_sec',
+                                     'seconds_per_round', 'qt_loaded', 'speedup')))
+
+def compare(results, baseline, tolerance):
+    """
+    Сравнивает результаты с предыдущим запуском.
+
+    Args:
+        results: Записи текущего запуска
+        baseline: Записи предыдущего запуска
+        tolerance: Допустимое относительное замедление (0.2 - на 20%)
+
+    Returns:
+        Список кортежей (запись, отношение времени к предыдущему) для регрессий
+    """
+    previous = {result_key(entry): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        old = previous.get(result_key(entry))
+        if not old or not old['seconds_per_call'] or entry['seconds_per_call'] is None:
+            continue
+        ratio = entry['seconds_per_call'] / old['seconds_per_call']
+        if ratio > 1 + tolerance:
+            regressions.append((entry, ratio))
+    return regressions
+
+def metadata():
+    """Возвращает сведения об окружении запуска"""
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+def build_parser():
+    """Создает парсер аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Тесты производительности сети Фейстеля")
+    parser.add_argument('-o', '--output', help="Файл для сохранения результатов в JSON")
+    parser.add_argument('--compare', help="JSON предыдущего запуска для поиска регрессий")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Допустимое замедление относительно --compare (по умолчанию 0.25)")
+    parser.add_argument('--quick', action='store_true', help="Уменьшенная сетка параметров")
+    parser.add_argument('--engine', action='append', choices=sorted(ENGINES),
+                        help="Движок crypt_block (можно указать несколько раз)")
+    parser.add_argument('--seed', type=int, default=0, help="Начальное значение генератора")
+    parser.add_argument('--min-time', type=float, default=MIN_TIME,
+                        help=f"Минимальная длительность замера (по умолчанию {MIN_TIME} с)")
+    parser.add_argument('--parallel', action='store_true',
+                        help="Измерить масштабирование ParallelCipher по числу процессов")
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET,
+                        help=f"Допустимое время импорта ядра (по умолчанию {IMPORT_BUDGET} с)")
+    return parser
+
+def main(argv=None):
+    """Точка входа набора тестов производительности"""
+    args = build_parser().parse_args(argv)
+    grid = ((QUICK_BLOCK_SIZES, QUICK_KEY_LENGTHS, QUICK_ROUNDS) if args.quick
+            else (BLOCK_SIZES, KEY_LENGTHS, ROUNDS))
+    results = run_benchmarks(*grid, engines=args.engine, seed=args.seed,
+                             min_time=args.min_time, log=sys.stdout)
+    if args.parallel:
+        results += measure_parallel(log=sys.stdout)
+    import_entry = measure_import()
+    results.append(import_entry)
+    import_time = import_entry['seconds_per_call']
+    report = {'metadata': metadata(), 'results': results}
+    failed = False
+    if import_time is None:
+        print(f"Ошибка: время импорта {CORE_MODULE} не найдено в выводе -X importtime")
+        failed = True
+    else:
+        print(f"Импорт {CORE_MODULE}: {import_time * 1e3:.1f} мс "
+              f"(бюджет {args.import_budget * 1e3:.0f} мс)")
+        if import_time > args.import_budget:
+            print(f"Ошибка: время импорта {CORE_MODULE} превышает бюджет")
+            failed = True
+    if import_entry['qt_loaded']:
+        print(f"Ошибка: импорт {CORE_MODULE} загружает Qt")
+        failed = True
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for entry, ratio in regressions:
+            params = {k: v for k, v in result_key(entry) if k != 'name'}
+            print(f"Регрессия: {entry['name']} {params} "
+                  f"медленнее в {ratio:.2f} раза")
+        if regressions:
+            return 1
+        print("Регрессий не обнаружено")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Консольный интерфейс для шифрования файлов сетью Фейстеля без GUI.
+
+Примеры:
+    python cli.py encrypt -k nezachet -i plain.bin -o cipher.bin
+    python cli.py decrypt -k nezachet -i cipher.bin -o plain.bin
+    python cli.py encrypt -k nezachet -m ctr -i plain.bin -o cipher.bin
+    cat plain.bin | python cli.py encrypt -k nezachet > cipher.bin
+    python cli.py encrypt -k nezachet --in-place -i data.bin
+"""
+
+import argparse
+import sys
+
+from feistel import ENGINES
+from mapped import decrypt_file_inplace, encrypt_file_inplace
+from modes import DEFAULT_BLOCK_SIZE, MODES
+from stream import decrypt_stream, encrypt_stream
+
+def build_parser():
+    """Создает парсер аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        description="Потоковое шифрование/дешифрование файлов сетью Фейстеля")
+    parser.add_argument('action', choices=('encrypt', 'decrypt'),
+                        help="Операция: encrypt - шифрование, decrypt - дешифрование")
+    key_group = parser.add_mutually_exclusive_group(required=True)
+    key_group.add_argument('-k', '--key', help="Ключ в виде строки (UTF-8)")
+    key_group.add_argument('--key-file', help="Файл, содержимое которого используется как ключ")
+    parser.add_argument('-r', '--rounds', type=int, default=10,
+                        help="Количество раундов (по умолчанию 10)")
+    parser.add_argument('-b', '--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                        help=f"Размер блока в байтах (по умолчанию {DEFAULT_BLOCK_SIZE})")
+    parser.add_argument('-m', '--mode', choices=MODES, default='ecb',
+                        help="Режим работы блочного шифра (по умолчанию ecb)")
+    parser.add_argument('--iv', help="IV для режимов cbc и ctr в шестнадцатеричном виде "
+                                     "(по умолчанию случайный)")
+    parser.add_argument('-e', '--engine', choices=sorted(ENGINES), default='int',
+                        help="Движок раундов (по умолчанию int)")
+    parser.add_argument('-i', '--input', help="Входной файл (по умолчанию stdin)")
+    parser.add_argument('-o', '--output', help="Выходной файл (по умолчанию stdout)")
+    parser.add_argument('--in-place', action='store_true',
+                        help="Обработать входной файл на месте через mmap "
+                             "(для cbc и ctr IV задается параметром --iv и не сохраняется)")
+    return parser
+
+def read_key(args):
+    """Возвращает ключ из аргументов командной строки в виде bytes"""
+    if args.key_file:
+        with open(args.key_file, 'rb') as key_file:
+            return key_file.read()
+    return args.key.encode('utf-8')
+
+def run_in_place(args, key):
+    """Шифрует или дешифрует входной файл на месте"""
+    if not args.input or args.output:
+        raise ValueError("Для --in-place нужен входной файл (-i) и не нужен выходной")
+    process = decrypt_file_inplace if args.action == 'decrypt' else encrypt_file_inplace
+    iv = bytes.fromhex(args.iv) if args.iv else None
+    process(args.input, key, args.rounds, args.mode, iv, args.block_size, args.engine)
+
+def run(args):
+    """Выполняет операцию, описанную разобранными аргументами"""
+    key = read_key(args)
+    if not key:
+        raise ValueError("Ключ не должен быть пустым")
+    if args.in_place:
+        return run_in_place(args, key)
+    options = {'mode': args.mode}
+    if args.action == 'decrypt':
+        process = decrypt_stream
+    else:
+        process = encrypt_stream
+        if args.iv:
+            options['iv'] = bytes.fromhex(args.iv)
+
+    src = open(args.input, 'rb') if args.input else sys.stdin.buffer
+    try:
+        dst = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        try:
+            process(src, dst, key, args.rounds, args.block_size, args.engine, **options)
+        finally:
+            if args.output:
+                dst.close()
+    finally:
+        if args.input:
+            src.close()
+
+def main(argv=None):
+    """Точка входа консольного интерфейса"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        run(args)
+    except (OSError, ValueError) as error:
+        parser.exit(1, f"Ошибка: {error}\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""
+Ядро сети Фейстеля без зависимости от Qt.
+
+Графический интерфейс находится в модуле gui и загружается только при
+запуске main.main(), поэтому import feistel подходит для консольных
+утилит, пакетной обработки и рабочих процессов.
+"""
+
+from feistel.core import (KeySchedule, as_buffer, bit_left, crypt_round, crypt_round_bytes,
+                          crypt_round_into, f, f_bytes, f_int, f_into, fit_key,
+                          get_key_schedule, keys_gen, keys_gen_bytes, pad_block, pad_message,
+                          permutation_table, permute_bytes, permute_word, unpad_message,
+                          vec_invert, vec_xor, xor_bytes)
+from feistel.engines import (BIT_CHAR_TABLES, BULK_ENGINES, ENGINES, FUSED_TABLE,
+                             KEY_SHIFT_TABLE, CompiledCipher, RoundTrace, bitslice_transpose,
+                             bitslice_untranspose, bind_engine, crypt_bitsliced,
+                             crypt_block, crypt_block_bytes, f_table, get_engine)
+
+__all__ = [
+    'BIT_CHAR_TABLES', 'BULK_ENGINES', 'ENGINES', 'FUSED_TABLE', 'KEY_SHIFT_TABLE',
+    'CompiledCipher', 'KeySchedule', 'RoundTrace',
+    'as_buffer', 'bind_engine', 'bit_left', 'bitslice_transpose', 'bitslice_untranspose',
+    'crypt_bitsliced', 'crypt_block', 'crypt_block_bytes', 'crypt_round',
+    'crypt_round_bytes', 'crypt_round_into', 'f', 'f_bytes', 'f_int', 'f_into',
+    'f_table', 'fit_key', 'get_engine', 'get_key_schedule', 'keys_gen', 'keys_gen_bytes',
+    'pad_block', 'pad_message', 'permutation_table', 'permute_bytes', 'permute_word',
+    'unpad_message', 'vec_invert', 'vec_xor', 'xor_bytes',
+]
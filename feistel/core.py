@@ -0,0 +1,451 @@
+"""
+Примитивы сети Фейстеля: операции над векторами, расписание ключей,
+раунд и дополнение сообщений.
+
+Модуль не зависит от Qt и импортируется быстро, поэтому подходит для
+консольных утилит и рабочих процессов.
+"""
+
+import functools
+import operator
+
+
+def vec_xor(vec1, vec2):
+    """
+    Выполняет побитовую операцию XOR между элементами двух векторов разной длины.
+    Более короткий вектор дополняется нулями до длины большего.
+    """
+    result = []
+    max_len = max(len(vec1), len(vec2))
+    
+    for i in range(max_len):
+        v1 = vec1[i] if i < len(vec1) else 0
+        v2 = vec2[i] if i < len(vec2) else 0
+        result.append(v1 ^ v2)
+    
+    return result
+
+def vec_invert(vect):
+    """
+    Выполняет побитовую инверсию каждого элемента вектора.
+    
+    Args:
+        vect: Исходный вектор байтов
+    
+    Returns:
+        Новый вектор с инвертированными битами, ограниченными 8 битами (0-255)
+    """
+    return [~x & 0xFF for x in vect]  # Маска 0xFF для ограничения результата одним байтом
+
+def bit_left(vect):
+    """
+    Выполняет побитовый сдвиг влево для каждого элемента вектора.
+    
+    Args:
+        vect: Исходный вектор байтов
+    
+    Returns:
+        Новый вектор со сдвинутыми влево битами, ограниченными 8 битами (0-255)
+    """
+    return [(x << 1) & 0xFF for x in vect]  # Маска для ограничения результата одним байтом
+
+@functools.lru_cache(maxsize=1024)
+def permutation_table(length, key):
+    """
+    Возвращает индексы перестановки, выполняемой permute_word.
+    
+    Последовательность обменов зависит только от длины вектора и от
+    key % length, поэтому результат permute_word(word, key)[j] всегда равен
+    word[table[j]]. Таблицы вычисляются один раз и кэшируются.
+    
+    Args:
+        length: Длина переставляемого вектора
+        key: Ключ перестановки (целое число)
+    
+    Returns:
+        Кортеж индексов длины length
+    """
+    if length and not 0 <= key < length:
+        return permutation_table(length, key % length)
+    table = list(range(length))
+    for i in range(length):
+        # Вычисляем новую позицию элемента, используя ключ
+        new_index = (i + key) % length
+        # Меняем местами элементы
+        table[i], table[new_index] = table[new_index], table[i]
+    return tuple(table)
+
+@functools.lru_cache(maxsize=1024)
+def _permutation_getter(length, key):
+    """Кэшированная функция выборки элементов по таблице перестановки"""
+    table = permutation_table(length, key)
+    if length == 1:
+        return lambda word: (word[0],)
+    return operator.itemgetter(*table)
+
+def permute_word(word, key):
+    """
+    Выполняет перестановку элементов вектора на основе ключа.
+    
+    Args:
+        word: Исходный вектор байтов
+        key: Ключ перестановки (целое число)
+    
+    Returns:
+        Новый вектор с переставленными элементами
+    """
+    if not word:
+        return list(word)
+    length = len(word)
+    return list(_permutation_getter(length, key % length)(word))
+
+def permute_bytes(word, key):
+    """
+    Выполняет ту же перестановку, что и permute_word, одной выборкой по таблице.
+    
+    Args:
+        word: Исходный вектор (bytes, bytearray, memoryview или список)
+        key: Ключ перестановки (целое число)
+    
+    Returns:
+        Новый объект bytes с переставленными элементами
+    """
+    if not word:
+        return b''
+    length = len(word)
+    return bytes(_permutation_getter(length, key % length)(word))
+
+def f(right, key):
+    """
+    Функция Фейстеля - основная функция преобразования в сети.
+    
+    Args:
+        right: Правая половина блока
+        key: Ключ раунда
+    
+    Returns:
+        Преобразованный вектор для операции XOR с левой половиной блока
+    """
+    # Последовательно применяем XOR с ключом, инверсию и побитовый сдвиг влево
+    return bit_left(vec_invert(vec_xor(right, key)))
+
+class KeySchedule:
+    """
+    Предвычисленное расписание ключей раундов для пары (ключ, число раундов).
+    
+    Ключи хранятся компактно в виде кортежа bytes; расписание дешифрования
+    разделяет те же объекты в обратном порядке.
+    """
+    
+    def __init__(self, key, rounds):
+        self.key = bytes(key)
+        self.rounds = rounds
+        # Генерируем уникальный ключ для каждого раунда
+        self.encrypt_keys = tuple(permute_bytes(self.key, i) for i in range(rounds))
+        # Для дешифрования используем ключи в обратном порядке
+        self.decrypt_keys = self.encrypt_keys[::-1]
+        # Свернутые ключи по длине половины блока (только для half < len(key))
+        self._fitted = {}
+    
+    def keys(self, decrypt):
+        """Возвращает кортеж ключей раундов для выбранного режима"""
+        return self.decrypt_keys if decrypt else self.encrypt_keys
+    
+    def fitted_keys(self, decrypt, half):
+        """
+        Возвращает ключи раундов, приведенные к длине half функцией fit_key.
+        
+        Ключи не длиннее half возвращаются как есть, без копии. Свертка
+        выполняется один раз для каждой длины половины; свернутые ключи
+        короче исходных, поэтому кэш не превышает размер самого расписания.
+        """
+        if len(self.key) <= half:
+            fitted = self.encrypt_keys
+        else:
+            if half not in self._fitted:
+                self._fitted[half] = tuple(fit_key(k, half) for k in self.encrypt_keys)
+            fitted = self._fitted[half]
+        return fitted[::-1] if decrypt else fitted
+
+@functools.lru_cache(maxsize=128)
+def _cached_key_schedule(key, rounds):
+    return KeySchedule(key, rounds)
+
+def get_key_schedule(key, rounds):
+    """
+    Возвращает расписание ключей из ограниченного LRU-кэша.
+    
+    Args:
+        key: Базовый ключ шифрования (bytes-подобный объект или список)
+        rounds: Количество раундов шифрования
+    
+    Returns:
+        Объект KeySchedule, общий для всех вызовов с теми же параметрами
+    """
+    return _cached_key_schedule(bytes(key), rounds)
+
+def fit_key(key, length):
+    """
+    Приводит ключ раунда к длине не более length байтов.
+    
+    Короткий ключ возвращается без изменений: vec_xor и движки дополняют его
+    нулями при вычислении F, поэтому хранить дополнение не нужно. Длинный
+    ключ сворачивается: байт i складывается (XOR) с байтом i % length, и ни
+    один байт ключа не теряется.
+    
+    Args:
+        key: Ключ раунда (bytes-подобный объект)
+        length: Наибольшая длина (длина половины блока)
+    
+    Returns:
+        Ключ длины не более length типа bytes
+    """
+    key = bytes(key)
+    if len(key) <= length:
+        return key
+    if length == 0:
+        return b''
+    folded = bytearray(key[:length])
+    for i in range(length, len(key)):
+        folded[i % length] ^= key[i]
+    return bytes(folded)
+
+def keys_gen(key, decrypt, rounds):
+    """
+    Генерирует последовательность ключей для каждого раунда шифрования/дешифрования.
+    
+    Args:
+        key: Базовый ключ шифрования
+        decrypt: Флаг режима (True для дешифрования, False для шифрования)
+        rounds: Количество раундов шифрования
+    
+    Returns:
+        Список ключей для всех раундов
+    """
+    return [list(k) for k in get_key_schedule(key, rounds).keys(decrypt)]
+
+def crypt_round(block, round_key):
+    """
+    Выполняет один раунд шифрования в сети Фейстеля.
+    
+    Обертка совместимости над crypt_round_bytes для списков целых чисел.
+    
+    Args:
+        block: Блок данных для шифрования
+        round_key: Ключ текущего раунда
+    
+    Returns:
+        Преобразованный блок после одного раунда
+    """
+    return list(crypt_round_bytes(block, round_key))
+
+def pad_block(block):
+    """Дополняет блок до четной длины, если необходимо"""
+    if len(block) % 2 != 0:
+        return block + [0]  # Добавляем нулевой байт
+    return block
+
+def pad_message(data, block_size):
+    """
+    Дополняет сообщение до кратной block_size длины по ISO/IEC 7816-4.
+    
+    В отличие от pad_block, дополнение обратимо: добавляется байт 0x80 и
+    нули до границы блока. Если длина уже кратна размеру блока, добавляется
+    целый блок дополнения.
+    
+    Args:
+        data: Исходное сообщение (bytes-подобный объект)
+        block_size: Размер блока в байтах
+    
+    Returns:
+        Дополненное сообщение типа bytes
+    """
+    pad_len = block_size - len(data) % block_size
+    return bytes(data) + b'\x80' + bytes(pad_len - 1)
+
+def unpad_message(data, block_size=None):
+    """
+    Удаляет дополнение ISO/IEC 7816-4, добавленное pad_message.
+    
+    Args:
+        data: Дополненное сообщение или его последний блок
+        block_size: Размер блока; если задан, дополнение ищется только в
+            последних block_size байтах, иначе - во всем data
+    
+    Returns:
+        Сообщение без дополнения типа bytes
+    """
+    start = 0 if block_size is None else max(len(data) - block_size, 0)
+    # Дополнение целиком лежит в последнем блоке, поэтому байт 0x80 из
+    # предыдущих блоков не принимается за его начало
+    tail = bytes(data[start:]).rstrip(b'\x00')
+    if not tail or tail[-1] != 0x80:
+        raise ValueError("Некорректное дополнение сообщения")
+    return bytes(data[:start + len(tail) - 1])
+
+def as_buffer(data):
+    """
+    Приводит входные данные к буферу байтов, по возможности без копирования.
+    
+    Args:
+        data: bytes, bytearray, memoryview или список целых чисел 0-255
+    
+    Returns:
+        Объект bytes либо memoryview формата 'B' без копирования данных
+    """
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, (bytearray, memoryview)):
+        view = memoryview(data)
+        return view if view.format == 'B' and view.ndim == 1 else view.cast('B')
+    return bytes(data)
+
+def xor_bytes(data1, data2):
+    """
+    Выполняет XOR двух буферов одинаковой длины целиком, без цикла по байтам.
+    
+    Args:
+        data1: Первый буфер
+        data2: Второй буфер той же длины
+    
+    Returns:
+        Результат XOR типа bytes
+    """
+    value = int.from_bytes(data1, 'little') ^ int.from_bytes(data2, 'little')
+    return value.to_bytes(len(data1), 'little')
+
+def keys_gen_bytes(key, decrypt, rounds, half=None):
+    """
+    Байтовый аналог keys_gen: возвращает ключи раундов в виде bytes.
+    
+    Args:
+        key: Базовый ключ шифрования (bytes-подобный объект или список)
+        decrypt: Флаг режима (True для дешифрования, False для шифрования)
+        rounds: Количество раундов шифрования
+        half: Длина половины блока, до которой сворачиваются длинные ключи
+            (fit_key), или None, чтобы вернуть ключи как есть
+    
+    Returns:
+        Кортеж ключей раундов типа bytes из кэшированного KeySchedule
+    """
+    schedule = get_key_schedule(key, rounds)
+    if half is None:
+        return schedule.keys(decrypt)
+    return schedule.fitted_keys(decrypt, half)
+
+def f_into(out, right, key):
+    """
+    Функция Фейстеля, записывающая результат в заранее выделенный буфер.
+    
+    Вычисляет bit_left(vec_invert(vec_xor(right, key))) побайтно без
+    промежуточных списков. Длина out должна быть равна
+    max(len(right), len(key)).
+    
+    Args:
+        out: Буфер для результата (bytearray или записываемый memoryview)
+        right: Правая половина блока
+        key: Ключ раунда
+    
+    Returns:
+        Буфер out
+    """
+    r_len = len(right)
+    k_len = len(key)
+    for i in range(len(out)):
+        x = (right[i] if i < r_len else 0) ^ (key[i] if i < k_len else 0)
+        # ((~x) << 1) & 0xFF == ((x << 1) & 0xFE) ^ 0xFE
+        out[i] = ((x << 1) & 0xFE) ^ 0xFE
+    return out
+
+def f_bytes(right, key):
+    """
+    Функция Фейстеля для байтовых буферов.
+    
+    Args:
+        right: Правая половина блока
+        key: Ключ раунда
+    
+    Returns:
+        Новый bytearray длины max(len(right), len(key))
+    """
+    return f_into(bytearray(max(len(right), len(key))), right, key)
+
+def crypt_round_into(left, right, round_key):
+    """
+    Выполняет раунд сети Фейстеля на месте для половин фиксированной длины.
+    
+    Левая половина заменяется на left XOR F(right, round_key). После вызова
+    половины нужно поменять местами: новая левая часть - это right, новая
+    правая - измененный left. Требует len(left) == len(right) >= len(round_key).
+    
+    Args:
+        left: Левая половина блока (bytearray, изменяется на месте)
+        right: Правая половина блока
+        round_key: Ключ текущего раунда
+    
+    Returns:
+        Буфер left
+    """
+    k_len = len(round_key)
+    for i in range(k_len):
+        left[i] ^= (((right[i] ^ round_key[i]) << 1) & 0xFE) ^ 0xFE
+    for i in range(k_len, len(left)):
+        left[i] ^= ((right[i] << 1) & 0xFE) ^ 0xFE
+    return left
+
+def crypt_round_bytes(block, round_key):
+    """
+    Выполняет один раунд сети Фейстеля над байтовым буфером.
+    
+    Поведение полностью совпадает с crypt_round, включая рост блока, когда
+    ключ раунда длиннее правой половины.
+    
+    Args:
+        block: Блок данных (bytes, bytearray, memoryview или список)
+        round_key: Ключ текущего раунда
+    
+    Returns:
+        Новый bytearray после одного раунда
+    """
+    block = as_buffer(block)
+    round_key = as_buffer(round_key)
+    half = len(block) // 2
+    left = block[:half]
+    right = block[half:]
+    
+    # Результат: правая часть, за которой следует left XOR F(right, key)
+    out = bytearray(len(right) + max(len(right), len(round_key)))
+    out[:len(right)] = right
+    new_right = f_into(memoryview(out)[len(right):], right, round_key)
+    for i in range(half):
+        new_right[i] ^= left[i]
+    return out
+
+@functools.lru_cache(maxsize=256)
+def _repeat_byte_mask(value, length):
+    """
+    Возвращает целое число из length одинаковых байтов value.
+    
+    Маски кэшируются, так как длины половин блока повторяются от раунда к раунду.
+    """
+    return int.from_bytes(bytes([value]) * length, 'little')
+
+def f_int(right, key, length):
+    """
+    Функция Фейстеля над половиной блока, представленной одним целым числом.
+    
+    Байты хранятся в порядке little-endian, поэтому дополнение короткого
+    ключа нулями происходит автоматически. XOR, инверсия и сдвиг каждого
+    байта влево выполняются над всем числом сразу: ((~x) << 1) & 0xFF для
+    каждого байта эквивалентно ((x << 1) & 0xFE..FE) ^ 0xFE..FE.
+    
+    Args:
+        right: Правая половина блока в виде целого числа
+        key: Ключ раунда в виде целого числа
+        length: Длина результата в байтах
+    
+    Returns:
+        Результат функции F в виде целого числа
+    """
+    fe = _repeat_byte_mask(0xFE, length)
+    return (((right ^ key) << 1) & fe) ^ fe
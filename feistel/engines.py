@@ -0,0 +1,513 @@
+"""
+Движки раундов сети Фейстеля и шифрование блока (crypt_block_bytes, crypt_block).
+
+Каждый движок - функция run(block, keys, observer=None), зарегистрированная
+в ENGINES; движки, обрабатывающие сразу много блоков, дополнительно
+зарегистрированы в BULK_ENGINES.
+"""
+
+import functools
+import random
+
+from feistel.core import (_repeat_byte_mask, as_buffer, crypt_round_bytes, crypt_round_into,
+                          f_int, keys_gen_bytes, xor_bytes)
+
+def _crypt_bytes_engine(block, keys, observer=None):
+    """Движок 'bytes': раунды над bytearray-половинами на месте"""
+    half = len(block) // 2
+    
+    if len(block) % 2 == 0 and all(len(k) <= half for k in keys):
+        # Размер блока не меняется: работаем с двумя половинами на месте
+        left = bytearray(block[:half])
+        right = bytearray(block[half:])
+        if observer is None:
+            for round_key in keys:
+                crypt_round_into(left, right, round_key)
+                left, right = right, left
+        else:
+            for i, round_key in enumerate(keys):
+                crypt_round_into(left, right, round_key)
+                left, right = right, left
+                observer(i, bytes(left + right), round_key)
+        # Финальная перестановка
+        return bytes(right + left)
+    
+    # Общий случай: блок может расти от раунда к раунду
+    current = bytearray(block)
+    for i, round_key in enumerate(keys):
+        current = crypt_round_bytes(current, round_key)
+        if observer is not None:
+            observer(i, bytes(current), round_key)
+    half = len(current) // 2
+    return bytes(current[half:] + current[:half])
+
+def _crypt_int_engine(block, keys, observer=None):
+    """Движок 'int': каждая половина блока обрабатывается как одно целое число"""
+    length = len(block)
+    state = int.from_bytes(block, 'little')
+    half = length // 2
+    
+    if length % 2 == 0 and all(len(k) <= half for k in keys):
+        # Размер блока не меняется: половины - целые числа фиксированной длины
+        shift = 8 * half
+        fe = _repeat_byte_mask(0xFE, half)
+        left = state & ((1 << shift) - 1)
+        right = state >> shift
+        if observer is None:
+            for round_key in keys:
+                k = int.from_bytes(round_key, 'little')
+                left, right = right, left ^ ((((right ^ k) << 1) & fe) ^ fe)
+        else:
+            for i, round_key in enumerate(keys):
+                k = int.from_bytes(round_key, 'little')
+                left, right = right, left ^ ((((right ^ k) << 1) & fe) ^ fe)
+                observer(i, (left | right << shift).to_bytes(length, 'little'), round_key)
+        # Финальная перестановка
+        return (right | left << shift).to_bytes(length, 'little')
+    
+    # Общий случай: отслеживаем длину блока, которая может расти
+    for i, round_key in enumerate(keys):
+        half = length // 2
+        right_len = length - half
+        left = state & ((1 << 8 * half) - 1)
+        right = state >> 8 * half
+        out_len = max(right_len, len(round_key))
+        new_right = left ^ f_int(right, int.from_bytes(round_key, 'little'), out_len)
+        state = right | new_right << 8 * right_len
+        length = right_len + out_len
+        if observer is not None:
+            observer(i, state.to_bytes(length, 'little'), round_key)
+    half = length // 2
+    left = state & ((1 << 8 * half) - 1)
+    right = state >> 8 * half
+    return (right | left << 8 * (length - half)).to_bytes(length, 'little')
+
+@functools.lru_cache(maxsize=256)
+def f_table(key_byte):
+    """
+    Возвращает таблицу функции F для одного байта ключа.
+    
+    Args:
+        key_byte: Байт ключа раунда (0-255)
+    
+    Returns:
+        bytes длины 256, где table[x] == ((~(x ^ key_byte)) << 1) & 0xFF;
+        подходит для bytes.translate
+    """
+    return bytes(((~(x ^ key_byte)) << 1) & 0xFF for x in range(256))
+
+# Совмещенная таблица инверсии и сдвига (F при нулевом байте ключа)
+FUSED_TABLE = f_table(0)
+
+# Вклад байта ключа в F: f_table(k)[x] == FUSED_TABLE[x] ^ KEY_SHIFT_TABLE[k],
+# так как сдвиг и инверсия дистрибутивны относительно XOR
+KEY_SHIFT_TABLE = bytes((k << 1) & 0xFE for k in range(256))
+
+@functools.lru_cache(maxsize=128)
+def _table_key_constants(keys):
+    """
+    Возвращает вклад каждого ключа раунда в F в виде целых чисел.
+    
+    Кортежи ключей берутся из KeySchedule, поэтому кэш привязан к расписанию.
+    """
+    return tuple(int.from_bytes(bytes(k).translate(KEY_SHIFT_TABLE), 'little') for k in keys)
+
+def _crypt_table_engine(block, keys, observer=None):
+    """
+    Движок 'table': F вычисляется через bytes.translate по таблице FUSED_TABLE.
+    
+    Для фиксированного ключа раунда F(r, k) побайтно равно
+    f_table(k)[r] == FUSED_TABLE[r] ^ KEY_SHIFT_TABLE[k], поэтому на каждый раунд нужен один
+    вызов translate и XOR с заранее вычисленной константой ключа.
+    """
+    half = len(block) // 2
+    if len(block) % 2 != 0 or any(len(k) > half for k in keys):
+        # Блок растет: таблицы не дают выигрыша, используем общий путь
+        return _crypt_bytes_engine(block, keys, observer)
+    
+    shift = 8 * half
+    left = int.from_bytes(block[:half], 'little')
+    right = bytes(block[half:])
+    for i, const in enumerate(_table_key_constants(tuple(keys))):
+        new_right = left ^ int.from_bytes(right.translate(FUSED_TABLE), 'little') ^ const
+        left = int.from_bytes(right, 'little')
+        right = new_right.to_bytes(half, 'little')
+        if observer is not None:
+            observer(i, (left | new_right << shift).to_bytes(len(block), 'little'), keys[i])
+    # Финальная перестановка
+    return right + left.to_bytes(half, 'little')
+
+@functools.lru_cache(maxsize=32)
+def _affine_tables(rounds):
+    """
+    Возвращает таблицы линейной части шифра для заданного числа раундов.
+    
+    F(r, k) = bit_left(r) ^ bit_left(k) ^ 0xFE побайтно, и все операции раунда
+    действуют на каждую позицию j независимо, причем одинаково. Поэтому без
+    учета ключей весь шифр - одно и то же линейное отображение пары байтов
+    (left[j], right[j]) для всех j, которое задается четырьмя таблицами:
+    новый left[j] = TA[left[j]] ^ TB[right[j]], новый right[j] =
+    TC[left[j]] ^ TD[right[j]]. Таблицы строятся по образам 16 базисных
+    векторов блока из двух байтов с нулевым ключом.
+    
+    Returns:
+        Кортеж (TA, TB, TC, TD) из объектов bytes длины 256 для bytes.translate
+    """
+    zero_keys = (b'\x00',) * rounds
+    offset = _crypt_int_engine(b'\x00\x00', zero_keys)
+    
+    def linear(block):
+        return xor_bytes(_crypt_int_engine(block, zero_keys), offset)
+    
+    tables = []
+    for position in range(2):
+        images = [b'\x00\x00'] * 256
+        for v in range(1, 256):
+            low = v & -v
+            if low == v:
+                block = bytearray(2)
+                block[position] = v
+                images[v] = linear(block)
+            else:
+                images[v] = xor_bytes(images[v ^ low], images[low])
+        tables.append((bytes(image[0] for image in images),
+                       bytes(image[1] for image in images)))
+    (ta, tc), (tb, td) = tables
+    return ta, tb, tc, td
+
+@functools.lru_cache(maxsize=128)
+def _affine_constant(keys, length):
+    """
+    Возвращает образ нулевого блока длины length - вклад ключей в шифр.
+    
+    Кортежи ключей берутся из KeySchedule, поэтому кэш привязан к расписанию.
+    """
+    return _crypt_int_engine(bytes(length), keys)
+
+def _compile_affine(keys, length):
+    """
+    Возвращает (TA, TB, TC, TD, E(0)) для ключей раундов keys и блока длины length.
+    
+    E(0) возвращается целым числом (little-endian), как его использует _apply_affine.
+    """
+    keys = tuple(keys)
+    const = int.from_bytes(_affine_constant(keys, length), 'little')
+    return _affine_tables(len(keys)) + (const,)
+
+def _compilable(keys, length):
+    """Проверяет, что блок длины length с ключами keys не растет (см. _crypt_compiled_engine)"""
+    return length % 2 == 0 and all(len(k) <= length // 2 for k in keys)
+
+def _apply_affine(ta, tb, tc, td, const, block):
+    """Применяет аффинное преобразование из _compile_affine к блоку четной длины"""
+    half = len(block) // 2
+    left = bytes(block[:half])
+    right = bytes(block[half:])
+    new_left = (int.from_bytes(left.translate(ta), 'little')
+                ^ int.from_bytes(right.translate(tb), 'little'))
+    new_right = (int.from_bytes(left.translate(tc), 'little')
+                 ^ int.from_bytes(right.translate(td), 'little'))
+    return (const ^ new_left ^ new_right << 8 * half).to_bytes(len(block), 'little')
+
+class CompiledCipher:
+    """
+    Шифр, свернутый в одно аффинное преобразование блока фиксированной длины.
+    
+    Раунды сети линейны над GF(2) с точностью до констант, поэтому
+    E(x) = A(x) ^ E(0), где A не зависит от ключа. A вычисляется четырьмя
+    вызовами bytes.translate (см. _affine_tables), E(0) - один раз при
+    компиляции, так что стоимость шифрования не зависит от числа раундов.
+    Результат совпадает с crypt_block_bytes (legacy_growth=False).
+    
+    Использование:
+        cipher = CompiledCipher(b'nezachet', 10, 64)
+        ciphertext = cipher(block)
+    """
+    
+    def __init__(self, key, rounds, length, decrypt=False, verify=True):
+        if length <= 0 or length % 2 != 0:
+            raise ValueError("Длина блока должна быть положительным четным числом")
+        self.key = bytes(key)
+        self.rounds = rounds
+        self.length = length
+        self.decrypt = decrypt
+        keys = keys_gen_bytes(self.key, decrypt, rounds, length // 2)
+        # Таблицы и константа вычисляются один раз, поэтому вызов не
+        # зависит от числа раундов
+        self._ta, self._tb, self._tc, self._td, self._const = _compile_affine(keys, length)
+        if verify and not self.verify():
+            raise ValueError("Скомпилированный шифр не совпадает с crypt_block_bytes")
+    
+    def __call__(self, block):
+        """Шифрует или дешифрует блок длины length и возвращает bytes"""
+        block = as_buffer(block)
+        if len(block) != self.length:
+            raise ValueError(f"Ожидается блок длины {self.length}")
+        return _apply_affine(self._ta, self._tb, self._tc, self._td, self._const, block)
+    
+    def verify(self, samples=8, seed=0):
+        """
+        Сравнивает результат с crypt_block_bytes побитно.
+        
+        Проверяются нулевой блок, блок из единичных битов и samples
+        случайных блоков.
+        
+        Returns:
+            True, если все результаты совпали
+        """
+        rng = random.Random(seed)
+        blocks = [bytes(self.length), b'\xff' * self.length]
+        blocks += [rng.randbytes(self.length) for _ in range(samples)]
+        return all(self(block) == crypt_block_bytes(block, self.key, self.decrypt,
+                                                    self.rounds, 'int')
+                   for block in blocks)
+
+def _crypt_compiled_engine(block, keys, observer=None):
+    """
+    Движок 'compiled': все раунды свернуты в аффинное преобразование (см. CompiledCipher).
+    
+    Промежуточных состояний нет, поэтому с observer, а также при росте блока
+    используется движок 'int'. Для многих блоков одними ключами преобразование
+    лучше получить один раз через bind_engine.
+    """
+    if observer is not None or not _compilable(keys, len(block)):
+        return _crypt_int_engine(block, keys, observer)
+    return _apply_affine(*_compile_affine(keys, len(block)), block)
+
+# Таблицы для транспонирования: BIT_CHAR_TABLES[b][x] - символ '0' или '1' бита b байта x
+BIT_CHAR_TABLES = tuple(bytes(b'01'[(x >> b) & 1] for x in range(256)) for b in range(8))
+
+# Обратное преобразование символов '0' и '1' в байты 0 и 1
+_BIT_VALUE_TABLE = bytes.maketrans(b'01', b'\x00\x01')
+
+def bitslice_transpose(data, block_size):
+    """
+    Раскладывает подряд идущие блоки на битовые плоскости.
+    
+    Плоскость с номером 8 * j + b - целое число, бит n которого равен биту b
+    байта j блока n. Столбец байтов j всех блоков берется одним срезом с
+    шагом, а плоскости строятся через bytes.translate и int(..., 2).
+    
+    Args:
+        data: Данные, длина которых кратна block_size
+        block_size: Размер блока в байтах
+    
+    Returns:
+        Список из 8 * block_size плоскостей
+    """
+    data = bytes(data)
+    planes = []
+    for j in range(block_size):
+        # Символы переворачиваются, чтобы блок 0 попал в младший бит
+        column = data[j::block_size][::-1]
+        planes.extend(int(column.translate(table), 2) for table in BIT_CHAR_TABLES)
+    return planes
+
+def bitslice_untranspose(planes, count, block_size):
+    """
+    Собирает блоки из битовых плоскостей (обратно к bitslice_transpose).
+    
+    Args:
+        planes: Список из 8 * block_size плоскостей
+        count: Количество блоков
+        block_size: Размер блока в байтах
+    
+    Returns:
+        Блоки подряд типа bytes
+    """
+    out = bytearray(count * block_size)
+    for j in range(block_size):
+        column = 0
+        for b in range(8):
+            bits = format(planes[8 * j + b], 'b').zfill(count)[::-1].encode()
+            column |= int.from_bytes(bits.translate(_BIT_VALUE_TABLE), 'little') << b
+        out[j::block_size] = column.to_bytes(count, 'little')
+    return bytes(out)
+
+# Наибольшая длина половины блока, для которой биты ключей кэшируются
+BITSLICE_CACHE_HALF = 1024
+
+def _bitslice_key_bits(keys, half):
+    """
+    Возвращает для каждого ключа раунда кортеж битов, инвертирующих плоскости F.
+    
+    Бит b байта j результата F равен NOT(right[j][b - 1] ^ key[j][b - 1]) при
+    b > 0 и нулю при b == 0, поэтому плоскость инвертируется, если
+    соответствующий бит ключа равен нулю. Ключи короче half дополняются
+    нулями здесь же, без копии ключа.
+    """
+    return tuple(tuple(i & 7 != 0 and not ((k[i >> 3] if i >> 3 < len(k) else 0)
+                                           >> ((i & 7) - 1)) & 1
+                       for i in range(8 * half))
+                 for k in keys)
+
+_cached_bitslice_key_bits = functools.lru_cache(maxsize=128)(_bitslice_key_bits)
+
+def crypt_bitsliced(data, keys, block_size):
+    """
+    Шифрует или дешифрует подряд идущие блоки одновременно в битовых плоскостях.
+    
+    Одна операция XOR над плоскостью обрабатывает один бит всех блоков сразу,
+    поэтому стоимость раунда почти не зависит от количества блоков. Требует
+    ключи раундов не длиннее block_size // 2 (см. keys_gen_bytes с параметром half).
+    
+    Args:
+        data: Данные, длина которых кратна block_size
+        keys: Ключи раундов, приведенные к длине половины блока (fit_key)
+        block_size: Четный размер блока в байтах
+    
+    Returns:
+        Результат типа bytes, совпадающий с обработкой каждого блока движком 'int'
+    """
+    count = len(data) // block_size
+    if count == 0:
+        return b''
+    width = 4 * block_size
+    mask = (1 << count) - 1
+    planes = bitslice_transpose(data, block_size)
+    # Дополнительная нулевая плоскость - источник для бита 0 результата F
+    left = planes[:width] + [0]
+    right = planes[width:] + [0]
+    sources = [i - 1 if i & 7 else width for i in range(width)]
+    key_bits = (_cached_bitslice_key_bits if width <= 8 * BITSLICE_CACHE_HALF
+                else _bitslice_key_bits)
+    for flips in key_bits(tuple(keys), block_size // 2):
+        left = [left[i] ^ right[s] ^ (mask if flip else 0)
+                for i, s, flip in zip(range(width), sources, flips)]
+        left.append(0)
+        left, right = right, left
+    # Финальная перестановка
+    return bitslice_untranspose(right[:width] + left[:width], count, block_size)
+
+def _crypt_bitslice_engine(block, keys, observer=None):
+    """
+    Движок 'bitslice' для одного блока; выигрыш дает только пакетная
+    обработка (BULK_ENGINES), поэтому с observer и при росте блока
+    используется движок 'int'.
+    """
+    half = len(block) // 2
+    if (observer is not None or half == 0 or len(block) % 2 != 0
+            or any(len(k) > half for k in keys)):
+        return _crypt_int_engine(block, keys, observer)
+    return crypt_bitsliced(block, keys, len(block))
+
+class RoundTrace:
+    """
+    Приемник состояний раундов для параметра observer функции crypt_block_bytes.
+    
+    Движок вызывает объект после каждого раунда с номером раунда, состоянием
+    блока (до финальной перестановки) и ключом раунда. Собранных состояний
+    достаточно для визуализации без повторного шифрования.
+    """
+    
+    def __init__(self):
+        self.states = []
+        self.round_keys = []
+    
+    def __call__(self, index, state, round_key):
+        self.states.append(state)
+        self.round_keys.append(round_key)
+
+# Доступные реализации раундов для crypt_block_bytes и crypt_block
+ENGINES = {
+    'bytes': _crypt_bytes_engine,
+    'int': _crypt_int_engine,
+    'table': _crypt_table_engine,
+    'compiled': _crypt_compiled_engine,
+    'bitslice': _crypt_bitslice_engine,
+}
+
+# Движки, обрабатывающие сразу много блоков: crypt_many(data, keys, block_size)
+BULK_ENGINES = {
+    'bitslice': crypt_bitsliced,
+}
+
+def get_engine(name):
+    """
+    Возвращает функцию движка run(block, keys, observer=None) по имени из ENGINES.
+    
+    Функция принимает буфер блока и последовательность ключей раундов и
+    возвращает результат типа bytes, включая финальную перестановку. Если
+    передан observer, он вызывается после каждого раунда как
+    observer(номер раунда, состояние блока, ключ раунда).
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Неизвестный движок: {name}")
+    return ENGINES[name]
+
+def bind_engine(name, keys, length):
+    """
+    Возвращает функцию run(block) движка name с фиксированными ключами раундов.
+    
+    Движок 'compiled' сворачивает ключи в аффинное преобразование (как
+    CompiledCipher) один раз, а не при каждом блоке, поэтому стоимость блока
+    не зависит от числа раундов.
+    
+    Args:
+        name: Имя движка из ENGINES
+        keys: Последовательность ключей раундов
+        length: Длина обрабатываемых блоков в байтах
+    """
+    run = get_engine(name)
+    if name == 'compiled' and _compilable(keys, length):
+        return functools.partial(_apply_affine, *_compile_affine(keys, length))
+    return functools.partial(run, keys=keys)
+
+def crypt_block_bytes(block, key, decrypt, rounds, engine='bytes', legacy_growth=False,
+                      observer=None):
+    """
+    Шифрует или дешифрует байтовый блок с использованием сети Фейстеля.
+    
+    По умолчанию длина блока сохраняется: ключи раундов, длиннее половины
+    блока, один раз сворачиваются до ее длины (fit_key), и все раунды
+    работают с буферами фиксированного размера. Для ключей не длиннее половины блока результат
+    совпадает с crypt_block. С legacy_growth=True результат побайтно
+    совпадает с crypt_block всегда, включая рост блока при длинном ключе.
+    
+    Движок 'bytes' выполняет раунды на месте над двумя заранее выделенными
+    половинами, движок 'int' - над половинами, представленными целыми
+    числами произвольной точности, что значительно быстрее на длинных блоках.
+    
+    Args:
+        block: Блок данных (bytes, bytearray, memoryview или список)
+        key: Ключ шифрования
+        decrypt: Флаг режима (True для дешифрования, False для шифрования)
+        rounds: Количество раундов шифрования
+        engine: Имя движка из ENGINES
+        legacy_growth: Флаг совместимости со старым поведением, при котором
+            блок растет, если ключ длиннее половины блока
+        observer: Необязательная функция observer(номер, состояние, ключ),
+            вызываемая после каждого раунда (например, RoundTrace). Без нее
+            цикл раундов не выполняет никакой дополнительной работы
+    
+    Returns:
+        Зашифрованный или дешифрованный блок типа bytes
+    """
+    run = get_engine(engine)
+    block = as_buffer(block)
+    if legacy_growth:
+        return run(block, keys_gen_bytes(key, decrypt, rounds), observer)
+    if len(block) % 2 != 0:
+        raise ValueError("Длина блока должна быть четной (см. pad_block)")
+    return run(block, keys_gen_bytes(key, decrypt, rounds, len(block) // 2), observer)
+
+def crypt_block(block, key, decrypt, rounds, engine='bytes', legacy_growth=True):
+    """
+    Шифрует или дешифрует блок данных с использованием сети Фейстеля.
+    
+    Обертка совместимости над crypt_block_bytes для списков целых чисел.
+    По умолчанию сохраняет исходное поведение, при котором блок растет, если
+    ключ длиннее половины блока.
+    
+    Args:
+        block: Блок данных для шифрования/дешифрования
+        key: Ключ шифрования
+        decrypt: Флаг режима (True для дешифрования, False для шифрования)
+        rounds: Количество раундов шифрования
+        engine: Имя движка из ENGINES ('bytes', 'int', 'table', 'compiled' или 'bitslice')
+        legacy_growth: False - сохранять длину блока (см. crypt_block_bytes)
+    
+    Returns:
+        Зашифрованный или дешифрованный блок данных
+    """
+    return list(crypt_block_bytes(block, key, decrypt, rounds, engine, legacy_growth))
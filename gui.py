@@ -0,0 +1,1598 @@
+"""
+Графический интерфейс (PyQt6) для визуализации работы сети Фейстеля.
+"""
+
+import binascii
+import functools
+import hashlib
+import math
+import mmap
+import os
+import sys
+import threading
+
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout,
+                            QHBoxLayout, QLabel, QTextEdit, QPlainTextEdit, QLineEdit, 
+                            QPushButton, QSpinBox, QTabWidget, QGraphicsScene, 
+                            QGraphicsView, QSplitter, QGridLayout, QToolBar,
+                            QProgressBar, QGraphicsItem, QStyleOptionGraphicsItem,
+                            QComboBox, QTableView, QHeaderView, QFileDialog)
+from PyQt6.QtCore import (Qt, QRectF, QPoint, QObject, QThread, pyqtSignal,
+                          QAbstractTableModel, QModelIndex)
+from PyQt6.QtGui import (QFont, QFontMetricsF, QPen, QBrush, QColor, QPainter, QAction,
+                         QIcon, QImage, qRgb, QKeySequence, QGuiApplication)
+
+from feistel import RoundTrace, crypt_block_bytes, get_engine, keys_gen_bytes, xor_bytes
+
+# Шрифты заголовков блоков и ключа раунда
+TITLE_FONT = QFont("Arial", 10)
+KEY_FONT = QFont("Courier", 9)
+
+# Поле документа QGraphicsTextItem по умолчанию (с каждой стороны)
+TEXT_MARGIN = 4
+
+@functools.lru_cache(maxsize=1024)
+def text_width(text, font):
+    """
+    Возвращает ширину элемента addText(text, font) без построения его макета.
+    
+    Ширина измеряется метриками шрифта и кэшируется: заголовки блоков
+    повторяются во всех раундах.
+    """
+    return QFontMetricsF(font).horizontalAdvance(text) + 2 * TEXT_MARGIN
+
+# Число байтов половины блока, показываемых в текстовом режиме
+BLOCK_PREVIEW_BYTES = 64
+
+# Режимы отображения содержимого блоков
+RENDER_TEXT = 'text'
+RENDER_VALUE = 'value'
+RENDER_DELTA = 'delta'
+RENDER_MODES = {
+    RENDER_TEXT: "Текст и HEX",
+    RENDER_VALUE: "Тепловая карта: значения байтов",
+    RENDER_DELTA: "Тепловая карта: изменения за раунд",
+}
+
+def gradient(anchors, count):
+    """Возвращает таблицу из count цветов qRgb, линейно интерполируя anchors"""
+    colors = []
+    for i in range(count):
+        position = i * (len(anchors) - 1) / max(count - 1, 1)
+        j = min(int(position), len(anchors) - 2)
+        t = position - j
+        colors.append(qRgb(*(round(a + (b - a) * t)
+                             for a, b in zip(anchors[j], anchors[j + 1]))))
+    return colors
+
+# Палитра значений байтов (0 - темно-синий, 255 - желтый)
+VALUE_PALETTE = gradient([(48, 18, 59), (40, 120, 200), (60, 190, 120), (250, 230, 40)], 256)
+
+# Палитра изменений: индекс - число измененных битов байта (0 - белый)
+DELTA_PALETTE = [qRgb(255, 255, 255)] + gradient([(255, 220, 120), (200, 20, 20)], 8)
+
+# Число единичных битов каждого байта для bytes.translate
+POPCOUNT_TABLE = bytes(bin(x).count('1') for x in range(256))
+
+class ByteHeatmapItem(QGraphicsItem):
+    """
+    Тепловая карта буфера: одна клетка на байт, цвет - по индексу в палитре.
+    
+    Изображение QImage формата Indexed8 строится из буфера индексов одним
+    вызовом, без цикла по байтам. HEX-значения показываются во всплывающей
+    подсказке и рисуются в клетках, когда масштаб позволяет их прочитать.
+    """
+    
+    # Наименьший размер клетки на экране (в пикселях), при котором рисуется HEX
+    HEX_CELL_PX = 18
+    HEX_FONT = QFont("Courier", 6)
+    
+    def __init__(self, data, indices, palette, rect):
+        super().__init__()
+        self.data = bytes(data)
+        self.rect = QRectF(rect)
+        count = len(self.data)
+        self.columns = max(1, math.ceil(math.sqrt(count * rect.width() / rect.height())))
+        self.rows = max(1, math.ceil(count / self.columns))
+        # Буфер должен жить, пока существует изображение
+        self._pixels = bytes(indices) + bytes(self.rows * self.columns - count)
+        self.image = QImage(self._pixels, self.columns, self.rows, self.columns,
+                            QImage.Format.Format_Indexed8)
+        self.image.setColorTable(palette)
+        self.cell_width = self.rect.width() / self.columns
+        self.cell_height = self.rect.height() / self.rows
+        self.setAcceptHoverEvents(True)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+    
+    def boundingRect(self):
+        return self.rect
+    
+    def cell_rect(self, index):
+        """Возвращает прямоугольник клетки байта index"""
+        row, column = divmod(index, self.columns)
+        return QRectF(self.rect.x() + column * self.cell_width,
+                      self.rect.y() + row * self.cell_height,
+                      self.cell_width, self.cell_height)
+    
+    def index_at(self, pos):
+        """Возвращает номер байта в точке pos или None"""
+        column = int((pos.x() - self.rect.x()) // self.cell_width)
+        row = int((pos.y() - self.rect.y()) // self.cell_height)
+        index = row * self.columns + column
+        if 0 <= column < self.columns and 0 <= index < len(self.data):
+            return index
+        return None
+    
+    def paint(self, painter, option, widget=None):
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+        painter.drawImage(self.rect, self.image)
+        
+        # Закрываем клетки после последнего байта в нижней строке
+        tail = self.rows * self.columns - len(self.data)
+        if tail:
+            last = self.cell_rect(len(self.data))
+            painter.fillRect(QRectF(last.x(), last.y(), tail * self.cell_width,
+                                    self.cell_height), Qt.GlobalColor.white)
+        
+        # HEX только для клеток в перерисовываемой области и при крупном масштабе
+        scale = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if min(self.cell_width, self.cell_height) * scale < self.HEX_CELL_PX:
+            return
+        exposed = option.exposedRect.intersected(self.rect)
+        first_row = int((exposed.top() - self.rect.y()) // self.cell_height)
+        last_row = int((exposed.bottom() - self.rect.y()) // self.cell_height)
+        first_column = int((exposed.left() - self.rect.x()) // self.cell_width)
+        last_column = int((exposed.right() - self.rect.x()) // self.cell_width)
+        painter.setFont(self.HEX_FONT)
+        painter.setPen(Qt.GlobalColor.black)
+        for row in range(max(first_row, 0), min(last_row, self.rows - 1) + 1):
+            for column in range(max(first_column, 0), min(last_column, self.columns - 1) + 1):
+                index = row * self.columns + column
+                if index < len(self.data):
+                    painter.drawText(self.cell_rect(index), Qt.AlignmentFlag.AlignCenter,
+                                     f'{self.data[index]:02x}')
+    
+    def hoverMoveEvent(self, event):
+        index = self.index_at(event.pos())
+        self.setToolTip('' if index is None else f"Байт {index}: {self.data[index]:02x}")
+
+class FeistelBlockItem:
+    """Класс для визуализации блока данных в сети Фейстеля"""
+    
+    def __init__(self, scene, x, y, width, height, left_data, right_data, title="",
+                 texts=None, heatmap=None):
+        self.scene = scene
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.left_data = left_data
+        self.right_data = right_data
+        self.title = title
+        # Заранее отформатированные тексты половин (см. FeistelVisualizer.prepare)
+        self.texts = texts
+        # Индексы цветов половин и палитра (left, right, palette) для тепловой
+        # карты; None - текстовый режим
+        self.heatmap = heatmap
+        # Созданные элементы сцены (для удаления при виртуализации)
+        self.items = []
+        
+        self.draw()
+        
+    def draw(self):
+        # Рисуем общую рамку
+        self.items.append(self.scene.addRect(self.x, self.y, self.width, self.height, 
+                          QPen(Qt.GlobalColor.black), QBrush(Qt.GlobalColor.white)))
+        
+        # Рисуем разделение на левую и правую части
+        self.items.append(self.scene.addLine(self.x + self.width/2, self.y, 
+                          self.x + self.width/2, self.y + self.height, 
+                          QPen(Qt.GlobalColor.black)))
+        
+        # Добавляем заголовок
+        if self.title:
+            title_item = self.scene.addText(self.title, TITLE_FONT)
+            title_item.setPos(self.x + self.width/2 - text_width(self.title, TITLE_FONT)/2, 
+                             self.y - 20)
+            self.items.append(title_item)
+        
+        # Отображаем данные левой и правой частей
+        if self.heatmap is not None:
+            self.draw_heatmap()
+            return
+        if self.texts is not None:
+            left_text, right_text = self.texts
+        else:
+            left_text = self.format_data(self.left_data)
+            right_text = self.format_data(self.right_data)
+        
+        left_item = self.scene.addText(left_text, QFont("Courier", 8))
+        right_item = self.scene.addText(right_text, QFont("Courier", 8))
+        
+        left_item.setPos(self.x + 5, self.y + 5)
+        right_item.setPos(self.x + self.width/2 + 5, self.y + 5)
+        self.items += [left_item, right_item]
+    
+    def draw_heatmap(self):
+        """Отображает половины блока тепловыми картами байтов"""
+        left_indices, right_indices, palette = self.heatmap
+        half_width = self.width / 2
+        for offset, data, indices in ((0, self.left_data, left_indices),
+                                      (half_width, self.right_data, right_indices)):
+            if not data:
+                continue
+            item = ByteHeatmapItem(data, indices, palette,
+                                   QRectF(self.x + offset + 5, self.y + 5,
+                                          half_width - 10, self.height - 10))
+            self.scene.addItem(item)
+            self.items.append(item)
+    
+    @staticmethod
+    def format_data(data):
+        """
+        Форматирует данные для отображения.
+        
+        Показываются только первые BLOCK_PREVIEW_BYTES байтов: длинный текст
+        все равно не помещается в блок, а его разметка блокирует поток GUI.
+        """
+        if isinstance(data, (list, bytes, bytearray, memoryview)):
+            # Попытка преобразовать в читаемую строку
+            try:
+                preview = bytes(data[:BLOCK_PREVIEW_BYTES])
+                text = preview.decode('utf-8', errors='replace')
+                hex_repr = preview.hex(' ')
+                if len(data) > BLOCK_PREVIEW_BYTES:
+                    return f"{text}…\n{hex_repr} … ({len(data)} байт)"
+                return f"{text}\n{hex_repr}"
+            except:
+                return str(data)
+        return str(data)
+
+class FeistelRoundVisualizer:
+    """Класс для визуализации одного раунда сети Фейстеля"""
+    
+    def __init__(self, scene, x, y, width, height, round_num, prev_state, curr_state, round_key,
+                 prev_texts=None, curr_texts=None, prev_heatmap=None, curr_heatmap=None):
+        self.scene = scene
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.round_num = round_num
+        self.prev_state = prev_state
+        self.curr_state = curr_state
+        self.round_key = round_key
+        self.prev_texts = prev_texts
+        self.curr_texts = curr_texts
+        self.prev_heatmap = prev_heatmap
+        self.curr_heatmap = curr_heatmap
+        # Созданные элементы сцены (для удаления при виртуализации)
+        self.items = []
+        
+        self.draw()
+    
+    def remove(self):
+        """Удаляет элементы раунда со сцены"""
+        for item in self.items:
+            self.scene.removeItem(item)
+        self.items = []
+    
+    def draw(self):
+        # Рисуем заголовок раунда
+        title = f"Раунд {self.round_num}"
+        title_item = self.scene.addText(title, QFont("Arial", 12, QFont.Weight.Bold))
+        title_item.setPos(self.x + 10, self.y + 10)
+        self.items.append(title_item)
+        
+        # Размеры блока данных
+        block_width = 200
+        block_height = 80
+        
+        # Отображаем входное состояние (до раунда)
+        left_prev = self.prev_state[:len(self.prev_state)//2]
+        right_prev = self.prev_state[len(self.prev_state)//2:]
+        
+        self.items += FeistelBlockItem(self.scene, self.x + 50, self.y + 40, 
+                                       block_width, block_height, 
+                                       left_prev, right_prev, "До раунда",
+                                       self.prev_texts, self.prev_heatmap).items
+        
+        # Отображаем выходное состояние (после раунда)
+        left_curr = self.curr_state[:len(self.curr_state)//2]
+        right_curr = self.curr_state[len(self.curr_state)//2:]
+        
+        self.items += FeistelBlockItem(self.scene, self.x + self.width - block_width - 50, 
+                                       self.y + 40, block_width, block_height, 
+                                       left_curr, right_curr, "После раунда",
+                                       self.curr_texts, self.curr_heatmap).items
+        
+        # Отображаем ключ раунда
+        round_key = bytes(self.round_key)
+        key_text = f"Ключ раунда: {round_key.decode('utf-8', errors='replace')}"
+        key_item = self.scene.addText(key_text, KEY_FONT)
+        key_item.setPos(self.x + self.width/2 - text_width(key_text, KEY_FONT)/2, 
+                       self.y + self.height - 30)
+        self.items.append(key_item)
+        
+        # Рисуем стрелку от входного состояния к выходному
+        arrow_y = self.y + 40 + block_height/2
+        self.items.append(self.scene.addLine(self.x + 50 + block_width, arrow_y, 
+                          self.x + self.width - 50 - block_width, arrow_y, 
+                          QPen(Qt.GlobalColor.black, 2)))
+        
+        # Добавляем наконечник стрелки
+        arrow_size = 10
+        arrow_x = self.x + self.width - 50 - block_width
+        self.items.append(self.scene.addLine(arrow_x, arrow_y, 
+                          arrow_x - arrow_size, arrow_y - arrow_size, 
+                          QPen(Qt.GlobalColor.black, 2)))
+        self.items.append(self.scene.addLine(arrow_x, arrow_y, 
+                          arrow_x - arrow_size, arrow_y + arrow_size, 
+                          QPen(Qt.GlobalColor.black, 2)))
+
+class ZoomableGraphicsView(QGraphicsView):
+    # Видимая область сцены изменилась (прокрутка, масштаб или размер окна)
+    visible_rect_changed = pyqtSignal(QRectF)
+    
+    def __init__(self, scene):
+        super().__init__(scene)
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        
+        # Начальный масштаб
+        self._zoom = 1
+    
+    def visible_scene_rect(self):
+        """Возвращает видимую область в координатах сцены"""
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+    
+    def notify_visible(self):
+        """Сообщает о новой видимой области"""
+        self.visible_rect_changed.emit(self.visible_scene_rect())
+    
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.notify_visible()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.notify_visible()
+        
+    def wheelEvent(self, event):
+        """Обработка события прокрутки колеса мыши для масштабирования"""
+        # Определение направления прокрутки
+        factor = 1.2
+        if event.angleDelta().y() < 0:
+            factor = 1.0 / factor
+        
+        # Ограничение масштаба
+        curr_zoom = self._zoom * factor
+        if 0.2 <= curr_zoom <= 5:
+            self._zoom = curr_zoom
+            self.scale(factor, factor)
+            self.notify_visible()
+    
+    def fitInView(self):
+        """Подстраивает вид так, чтобы вся сцена была видна"""
+        self.resetTransform()
+        self._zoom = 1
+        rect = self.scene().sceneRect()
+        viewrect = self.viewport().rect()
+        xratio = viewrect.width() / rect.width()
+        yratio = viewrect.height() / rect.height()
+        factor = min(xratio, yratio)
+        self.scale(factor, factor)
+        self._zoom = factor
+        self.notify_visible()
+    
+    def fitWidth(self):
+        """Подстраивает масштаб по ширине сцены и показывает ее начало"""
+        self.resetTransform()
+        factor = self.viewport().rect().width() / self.scene().sceneRect().width()
+        self.scale(factor, factor)
+        self._zoom = factor
+        self.verticalScrollBar().setValue(self.verticalScrollBar().minimum())
+        self.notify_visible()
+    
+    def zoomIn(self):
+        """Увеличивает масштаб"""
+        factor = 1.2
+        curr_zoom = self._zoom * factor
+        if curr_zoom <= 5:
+            self._zoom = curr_zoom
+            self.scale(factor, factor)
+            self.notify_visible()
+    
+    def zoomOut(self):
+        """Уменьшает масштаб"""
+        factor = 1.0 / 1.2
+        curr_zoom = self._zoom * factor
+        if curr_zoom >= 0.2:
+            self._zoom = curr_zoom
+            self.scale(factor, factor)
+            self.notify_visible()
+    
+    def resetZoom(self):
+        """Сбрасывает масштаб к 100%"""
+        self.resetTransform()
+        self._zoom = 1
+        self.notify_visible()
+
+# Объем памяти, который могут занимать состояния раундов и результаты в кэшах
+CACHE_BUDGET = 256 << 20
+
+class CacheBudget:
+    """
+    Общий бюджет памяти нескольких кэшей с вытеснением давно не использованных записей.
+    
+    Кэш сообщает размер каждой записи (charge) и отмечает ее использование
+    (touch); при превышении бюджета вытесняется самая старая запись любого
+    из кэшей вызовом его метода evict(key). Объекты, на которые ссылаются
+    записи разных кэшей, учитываются в каждой из них, поэтому учтенный
+    размер - верхняя граница занятой кэшами памяти.
+    """
+    
+    def __init__(self, limit=CACHE_BUDGET):
+        self.limit = limit
+        self.size = 0
+        # Размеры записей по (кэш, ключ); последние использованные - в конце
+        self.entries = {}
+        # Общая блокировка всех кэшей бюджета (evict вызывается под ней)
+        self.lock = threading.RLock()
+    
+    def charge(self, cache, key, size):
+        """
+        Учитывает размер записи, вытесняя старые записи сверх бюджета.
+        
+        Returns:
+            False, если запись больше всего бюджета и хранить ее нельзя
+        """
+        with self.lock:
+            self.release(cache, key)
+            if size > self.limit:
+                return False
+            while self.entries and self.size + size > self.limit:
+                (owner, old_key), old_size = next(iter(self.entries.items()))
+                self.release(owner, old_key)
+                owner.evict(old_key)
+            self.entries[(cache, key)] = size
+            self.size += size
+            return True
+    
+    def touch(self, cache, key):
+        """Отмечает запись как последнюю использованную"""
+        with self.lock:
+            size = self.entries.pop((cache, key), None)
+            if size is not None:
+                self.entries[(cache, key)] = size
+    
+    def release(self, cache, key):
+        """Перестает учитывать запись (без вызова evict)"""
+        with self.lock:
+            size = self.entries.pop((cache, key), None)
+            if size is not None:
+                self.size -= size
+
+# Бюджет, общий для кэша состояний раундов и кэша результатов
+shared_budget = CacheBudget()
+
+def swap_halves(state):
+    """Меняет половины состояния местами (финальная перестановка)"""
+    half = len(state) // 2
+    return bytes(state[half:]) + bytes(state[:half])
+
+class RoundStateChain:
+    """
+    Состояния раундов шифрования одного блока одним ключом.
+    
+    Ключи шифрования для r раундов - префикс ключей для r + 1 раундов,
+    поэтому состояния для меньшего числа раундов - префикс сохраненных, а
+    для большего - досчитываются от последнего сохраненного состояния.
+    """
+    
+    def __init__(self, block, key):
+        # Цепочка хранится в кэше дольше вычисления, поэтому владеет копией
+        # блока: отображенный в память файл может быть перезаписан или усечен
+        # (для bytes копия не создается)
+        self.block = bytes(block)
+        self.key = bytes(key)
+        # Состояние после каждого раунда (до финальной перестановки) и его ключ
+        self.states = []
+        self.round_keys = []
+        # Память, занятая цепочкой (см. sys.getsizeof)
+        self.nbytes = sys.getsizeof(self.block) + sys.getsizeof(self.key)
+    
+    def extend(self, rounds, observer=None, charge=None):
+        """
+        Досчитывает состояния до rounds раундов.
+        
+        Args:
+            rounds: Требуемое число раундов
+            observer: Необязательная функция observer(номер, состояние, ключ),
+                вызываемая только для досчитанных раундов. Если она прервет
+                вычисление исключением, уже досчитанные состояния сохранятся
+            charge: Необязательная функция charge(nbytes), вызываемая после
+                каждого досчитанного состояния с новым размером цепочки
+        """
+        done = len(self.states)
+        if rounds <= done:
+            return
+        keys = keys_gen_bytes(self.key, False, rounds, len(self.block) // 2)[done:]
+        start = self.states[-1] if self.states else self.block
+        
+        def collect(index, state, round_key):
+            self.states.append(state)
+            self.round_keys.append(round_key)
+            self.nbytes += sys.getsizeof(state) + sys.getsizeof(round_key)
+            if charge is not None:
+                charge(self.nbytes)
+            if observer is not None:
+                observer(done + index, state, round_key)
+        
+        # Движок 'int' продолжает с состояния без финальной перестановки
+        get_engine('int')(start, keys, collect)
+    
+    def encrypt_trace(self, rounds):
+        """Возвращает (RoundTrace, результат) шифрования за rounds раундов"""
+        trace = RoundTrace()
+        trace.states = self.states[:rounds]
+        trace.round_keys = self.round_keys[:rounds]
+        return trace, swap_halves(self.states[rounds - 1] if rounds else self.block)
+    
+    def decrypt_trace(self, rounds):
+        """
+        Возвращает (RoundTrace, результат) дешифрования результата шифрования
+        за rounds раундов.
+        
+        Состояния дешифрования - состояния шифрования в обратном порядке с
+        переставленными половинами, а ключи - ключи шифрования в обратном порядке.
+        """
+        trace = RoundTrace()
+        earlier = [self.block] + self.states[:rounds - 1]
+        trace.states = [swap_halves(state) for state in reversed(earlier)]
+        trace.round_keys = self.round_keys[rounds - 1::-1]
+        return trace, self.block
+
+class RoundStateCache:
+    """
+    Кэш состояний раундов по паре (открытый текст, ключ).
+    
+    При изменении числа раундов цепочка состояний шифрования удлиняется или
+    используется ее префикс. При дешифровании блока, полученного
+    шифрованием из кэша, состояния берутся из той же цепочки в обратном
+    порядке; остальные блоки дешифруются заново. Объем хранимых цепочек
+    ограничен бюджетом памяти (CacheBudget), общим с кэшем результатов.
+    """
+    
+    def __init__(self, budget=None):
+        self.budget = shared_budget if budget is None else budget
+        self.chains = {}
+    
+    def chain(self, block, key):
+        """
+        Возвращает цепочку для (block, key), создавая ее при необходимости.
+        
+        Блок в ключе кэша представлен хэшем, а не копией.
+        """
+        digest = hashlib.blake2b(block, digest_size=16).digest()
+        cache_key = (digest, len(block), bytes(key))
+        chain = self.chains.get(cache_key)
+        if chain is None:
+            chain = self.chains[cache_key] = RoundStateChain(block, key)
+        self.budget.touch(self, cache_key)
+        return chain, cache_key
+    
+    def evict(self, cache_key):
+        """Удаляет цепочку; вызывается бюджетом при вытеснении"""
+        self.chains.pop(cache_key, None)
+    
+    def find_encrypted(self, block, key, rounds):
+        """Возвращает цепочку, шифрование которой за rounds раундов дает block"""
+        target = swap_halves(block)
+        for cache_key, chain in self.chains.items():
+            if (chain.key == key and len(chain.states) >= rounds
+                    and chain.states[rounds - 1] == target):
+                self.budget.touch(self, cache_key)
+                return chain
+        return None
+    
+    def trace(self, block, key, rounds, decrypt, observer=None):
+        """
+        Возвращает (RoundTrace, результат) для блока, используя сохраненные состояния.
+        
+        Args:
+            block: Исходный блок четной длины
+            key: Ключ шифрования (bytes)
+            rounds: Количество раундов
+            decrypt: Флаг режима (True для дешифрования)
+            observer: Необязательная функция observer(номер, состояние, ключ),
+                вызываемая для вычисляемых (не взятых из кэша) раундов
+        """
+        if len(block) % 2 != 0:
+            raise ValueError("Длина блока должна быть четной (см. pad_block)")
+        key = bytes(key)
+        with self.budget.lock:
+            if not decrypt:
+                chain, cache_key = self.chain(block, key)
+                
+                def charge(nbytes):
+                    # Цепочка учитывается по мере роста, поэтому старые записи
+                    # вытесняются до того, как память будет занята. Цепочку
+                    # больше бюджета кэш перестает хранить, а ее состояния
+                    # остаются только у вызывающего
+                    if (cache_key in self.chains
+                            and not self.budget.charge(self, cache_key, nbytes)):
+                        self.evict(cache_key)
+                
+                try:
+                    chain.extend(rounds, observer, charge)
+                finally:
+                    charge(chain.nbytes)
+                return chain.encrypt_trace(rounds)
+            chain = self.find_encrypted(block, key, rounds) if rounds else None
+        if chain is not None:
+            return chain.decrypt_trace(rounds)
+        trace = RoundTrace()
+        
+        def collect(index, state, round_key):
+            trace(index, state, round_key)
+            if observer is not None:
+                observer(index, state, round_key)
+        
+        result = crypt_block_bytes(block, key, True, rounds, engine='int', observer=collect)
+        return trace, result
+
+class FeistelVisualizer:
+    """Класс для визуализации всего процесса шифрования/дешифрования"""
+    
+    # Геометрия сцены (увеличена для лучшей видимости)
+    WIDTH = 1000
+    ROUND_HEIGHT = 300
+    ROUND_SPACING = 30
+    X_MARGIN = 50
+    Y_MARGIN = 50
+    BLOCK_WIDTH = 400
+    BLOCK_HEIGHT = 150
+    # Верхний край первого раунда: заголовок и итоговые блоки
+    ROUNDS_TOP = Y_MARGIN + 50 + BLOCK_HEIGHT + 50
+    ROUND_STEP = ROUND_HEIGHT + ROUND_SPACING
+    
+    # Наибольшее число одновременно созданных раундов при виртуализации
+    MAX_VISIBLE_ROUNDS = 64
+    
+    # Состояния раундов, общие для всех визуализаций (см. RoundStateCache)
+    state_cache = RoundStateCache()
+    
+    def __init__(self, block, key, rounds, decrypt=False, trace=None, result=None,
+                 render_mode=RENDER_TEXT, observer=None):
+        # Визуализация хранится в кэше результатов, поэтому владеет копией
+        # блока (см. RoundStateChain); state_cache использует эту же копию
+        self.original_block = bytes(block)
+        self.key = bytes(key)
+        self.rounds = rounds
+        self.decrypt = decrypt
+        # Режим отображения содержимого блоков (см. RENDER_MODES)
+        self.render_mode = render_mode
+        # Тексты половин состояний, заполняются prepare()
+        self.texts = None
+        # Созданные раунды по номерам и вид при виртуализации (см. attach)
+        self.visible_rounds = {}
+        self.scene = None
+        self.view = None
+        
+        # Генерируем все промежуточные состояния (если они не получены
+        # при шифровании через RoundTrace)
+        self.states = self.generate_states(trace, result, observer)
+    
+    def generate_states(self, trace=None, result=None, observer=None):
+        """
+        Формирует список всех промежуточных состояний блока и ключей.
+        
+        Если переданы trace (RoundTrace) и result от crypt_block_bytes,
+        состояния берутся из них без повторного шифрования; иначе - из
+        state_cache, который вычисляет только недостающие раунды (observer
+        вызывается для каждого из них).
+        """
+        if trace is None:
+            trace, result = self.state_cache.trace(self.original_block, self.key,
+                                                   self.rounds, self.decrypt, observer)
+        
+        # Для отображения берутся ключи расписания, а не приведенные к
+        # половине блока (fit_key), которые получает движок
+        round_keys = keys_gen_bytes(self.key, self.decrypt, self.rounds)
+        states = [("Начальный блок", self.original_block, None)]
+        for i, (state, round_key) in enumerate(zip(trace.states, round_keys)):
+            states.append((f"Раунд {i+1}", state, round_key))
+        # Финальная перестановка
+        states.append(("Финальный результат", result, None))
+        
+        return states
+    
+    def prepare(self, check=None):
+        """
+        Заранее форматирует тексты половин всех состояний.
+        
+        Не использует Qt, поэтому может выполняться в фоновом потоке; затем
+        visualize только создает элементы сцены.
+        
+        Args:
+            check: Необязательная функция, вызываемая перед каждым состоянием
+                (например, для прерывания вычисления исключением)
+        """
+        if self.render_mode != RENDER_TEXT:
+            # Тепловые карты строятся из буферов напрямую, тексты не нужны
+            return
+        self.texts = []
+        for _, state, _ in self.states:
+            if check is not None:
+                check()
+            half = len(state) // 2
+            view = memoryview(state)
+            self.texts.append((FeistelBlockItem.format_data(view[:half]),
+                               FeistelBlockItem.format_data(view[half:])))
+    
+    def nbytes(self):
+        """
+        Возвращает объем памяти, удерживаемой визуализацией (sys.getsizeof):
+        состояния с подписями и ключами раундов и подготовленные тексты.
+        """
+        size = sys.getsizeof(self.states)
+        for entry in self.states:
+            size += sys.getsizeof(entry) + sum(map(sys.getsizeof, entry))
+        if self.texts is not None:
+            size += sys.getsizeof(self.texts)
+            for pair in self.texts:
+                size += sys.getsizeof(pair) + sum(map(sys.getsizeof, pair))
+        return size
+    
+    def state_texts(self, index):
+        """Возвращает тексты половин состояния index (из prepare или вычисляет их)"""
+        if self.texts is not None:
+            return self.texts[index]
+        state = self.states[index][1]
+        half = len(state) // 2
+        view = memoryview(state)
+        return (FeistelBlockItem.format_data(view[:half]),
+                FeistelBlockItem.format_data(view[half:]))
+    
+    def state_heatmap(self, index):
+        """
+        Возвращает (индексы левой половины, индексы правой половины, палитра)
+        для тепловой карты состояния index или None в текстовом режиме.
+        
+        В режиме изменений индекс байта - число битов, изменившихся по
+        сравнению с предыдущим состоянием (XOR и bytes.translate по таблице).
+        """
+        if self.render_mode == RENDER_TEXT:
+            return None
+        state = self.states[index][1]
+        half = len(state) // 2
+        if self.render_mode == RENDER_VALUE:
+            return state[:half], state[half:], VALUE_PALETTE
+        previous = self.states[index - 1][1] if index > 0 else state
+        if len(previous) != len(state):
+            # Блок вырос (legacy_growth): сравнивать нечего
+            previous = state
+        changes = xor_bytes(state, previous).translate(POPCOUNT_TABLE)
+        return changes[:half], changes[half:], DELTA_PALETTE
+    
+    def set_render_mode(self, render_mode):
+        """Меняет режим отображения и перерисовывает созданные элементы"""
+        self.render_mode = render_mode
+        if self.view is not None:
+            self.draw_header(self.scene)
+            self.update_visible(self.view.visible_scene_rect())
+    
+    def round_top(self, round_num):
+        """Возвращает координату y верхнего края раунда round_num (с 1)"""
+        return self.ROUNDS_TOP + (round_num - 1) * self.ROUND_STEP
+    
+    def rounds_in_rect(self, rect):
+        """
+        Возвращает диапазон номеров раундов, пересекающих прямоугольник сцены.
+        
+        Геометрия раундов одинакова, поэтому диапазон вычисляется без обхода
+        элементов сцены.
+        """
+        count = len(self.states) - 2
+        first = max(int((rect.top() - self.ROUNDS_TOP) // self.ROUND_STEP) + 1, 1)
+        last = min(int((rect.bottom() - self.ROUNDS_TOP) // self.ROUND_STEP) + 1, count)
+        return range(first, last + 1)
+    
+    def visualize(self, scene):
+        """Отображает визуализацию на графической сцене (все раунды сразу)"""
+        self.draw_header(scene)
+        for i in range(1, len(self.states) - 1):
+            self.draw_round(scene, i)
+    
+    def attach(self, scene, view):
+        """
+        Отображает визуализацию с виртуализацией раундов.
+        
+        Создаются только заголовок, итоговые блоки и раунды, пересекающие
+        видимую область view; при прокрутке и масштабировании раунды вне
+        области удаляются, а попавшие в нее - создаются.
+        """
+        self.draw_header(scene)
+        self.scene = scene
+        self.view = view
+        view.visible_rect_changed.connect(self.update_visible)
+        self.update_visible(view.visible_scene_rect())
+    
+    def detach(self):
+        """Отключает визуализацию от вида (сцена очищается отдельно)"""
+        if self.view is not None:
+            self.view.visible_rect_changed.disconnect(self.update_visible)
+        self.view = None
+        self.visible_rounds = {}
+    
+    def update_visible(self, rect):
+        """Приводит набор созданных раундов в соответствие с видимой областью"""
+        wanted = self.rounds_in_rect(rect)
+        if len(wanted) > self.MAX_VISIBLE_ROUNDS:
+            # При сильном уменьшении показываем раунды вокруг центра области
+            middle = wanted[len(wanted) // 2]
+            start = max(middle - self.MAX_VISIBLE_ROUNDS // 2, wanted.start)
+            wanted = range(start, min(start + self.MAX_VISIBLE_ROUNDS, wanted.stop))
+        for round_num in list(self.visible_rounds):
+            if round_num not in wanted:
+                self.visible_rounds.pop(round_num).remove()
+        for round_num in wanted:
+            if round_num not in self.visible_rounds:
+                self.visible_rounds[round_num] = self.draw_round(self.scene, round_num)
+    
+    def draw_header(self, scene):
+        """Очищает сцену, задает ее размер и рисует заголовок и итоговые блоки"""
+        scene.clear()
+        self.visible_rounds = {}
+        x_margin = self.X_MARGIN
+        y_offset = self.Y_MARGIN
+        block_width = self.BLOCK_WIDTH
+        block_height = self.BLOCK_HEIGHT
+        
+        # Размер сцены известен заранее: заголовок, итоговые блоки и раунды
+        scene.setSceneRect(0, 0, self.WIDTH + 2*x_margin,
+                           self.round_top(len(self.states) - 1) + self.Y_MARGIN)
+        
+        # Заголовок
+        operation_type = "Дешифрование" if self.decrypt else "Шифрование"
+        title = f"{operation_type} с использованием сети Фейстеля ({self.rounds} раундов)"
+        title_item = scene.addText(title, QFont("Arial", 14, QFont.Weight.Bold))
+        title_item.setPos(x_margin, y_offset)
+        y_offset += 50
+        
+        # Отображаем начальное и конечное состояния
+        last = len(self.states) - 1
+        initial_block = self.states[0][1]
+        final_block = self.states[last][1]
+        
+        left_initial = initial_block[:len(initial_block)//2]
+        right_initial = initial_block[len(initial_block)//2:]
+        
+        left_final = final_block[:len(final_block)//2]
+        right_final = final_block[len(final_block)//2:]
+        
+        # Начальный блок
+        FeistelBlockItem(scene, x_margin, y_offset, block_width, block_height, 
+                        left_initial, right_initial, "Исходный блок",
+                        self.state_texts(0) if self.render_mode == RENDER_TEXT else None,
+                        self.state_heatmap(0))
+        
+        # Конечный блок
+        FeistelBlockItem(scene, x_margin + self.WIDTH - block_width, y_offset, 
+                        block_width, block_height, left_final, right_final, 
+                        "Результат",
+                        self.state_texts(last) if self.render_mode == RENDER_TEXT else None,
+                        self.state_heatmap(last))
+    
+    def draw_round(self, scene, round_num):
+        """Рисует раунд round_num и возвращает его FeistelRoundVisualizer"""
+        text_mode = self.render_mode == RENDER_TEXT
+        return FeistelRoundVisualizer(scene, self.X_MARGIN, self.round_top(round_num),
+                                      self.WIDTH, self.ROUND_HEIGHT, round_num,
+                                      self.states[round_num - 1][1],
+                                      self.states[round_num][1],
+                                      self.states[round_num][2],
+                                      self.state_texts(round_num - 1) if text_mode else None,
+                                      self.state_texts(round_num) if text_mode else None,
+                                      self.state_heatmap(round_num - 1),
+                                      self.state_heatmap(round_num))
+
+# Наибольшее число раундов в GUI (раунды сцены создаются виртуально)
+MAX_ROUNDS = 10000
+
+# Сцену с не большим числом раундов вписываем в окно целиком
+FIT_ROUNDS = 20
+
+# Число байтов результата, показываемых в виде текста над HEX-просмотрщиком
+RESULT_PREVIEW_BYTES = 256
+
+def format_result(result_block):
+    """Форматирует краткую сводку результата: размер и начало текста"""
+    preview = bytes(result_block[:RESULT_PREVIEW_BYTES]).decode('utf-8', errors='replace')
+    ellipsis = "…" if len(result_block) > RESULT_PREVIEW_BYTES else ""
+    return f"Текст: {preview}{ellipsis}\nРазмер: {len(result_block)} байт"
+
+# Число байтов открытого файла, показываемых в поле ввода
+INPUT_PREVIEW_BYTES = 4096
+
+def map_file(path):
+    """
+    Отображает файл в память только для чтения.
+    
+    Args:
+        path: Путь к файлу
+    
+    Returns:
+        memoryview содержимого файла (пустой bytes для пустого файла)
+    """
+    with open(path, 'rb') as fileobj:
+        # Пустой файл нельзя отобразить в память
+        if os.fstat(fileobj.fileno()).st_size == 0:
+            return b''
+        # Отображение остается действительным после закрытия файла и
+        # освобождается, когда на него не остается ссылок
+        return memoryview(mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ))
+
+# Форматы ввода исходных данных в текстовом поле
+INPUT_TEXT = 'text'
+INPUT_HEX = 'hex'
+INPUT_BASE64 = 'base64'
+INPUT_FORMATS = {
+    INPUT_TEXT: "Текст (UTF-8)",
+    INPUT_HEX: "HEX",
+    INPUT_BASE64: "Base64",
+}
+
+def decode_input(text, input_format):
+    """
+    Преобразует содержимое поля ввода в байты.
+    
+    HEX и Base64 декодируются встроенными кодеками (bytes.fromhex,
+    binascii) сразу в bytes; пробелы и переводы строк игнорируются.
+    
+    Args:
+        text: Содержимое поля ввода
+        input_format: Формат из INPUT_FORMATS
+    
+    Returns:
+        Данные типа bytes
+    """
+    if input_format == INPUT_TEXT:
+        return text.encode('utf-8')
+    if input_format == INPUT_HEX:
+        try:
+            return bytes.fromhex(text)
+        except ValueError:
+            raise ValueError("Некорректная HEX-строка") from None
+    if input_format == INPUT_BASE64:
+        try:
+            return binascii.a2b_base64(text.encode('ascii'))
+        except ValueError:
+            raise ValueError("Некорректная строка Base64") from None
+    raise ValueError(f"Неизвестный формат ввода: {input_format}")
+
+def save_buffer(path, data):
+    """Записывает буфер в файл без промежуточного преобразования в строку"""
+    with open(path, 'wb') as fileobj:
+        fileobj.write(data)
+
+# Замена непечатаемых байтов точкой для столбца ASCII
+ASCII_TABLE = bytes(x if 0x20 <= x < 0x7F else ord('.') for x in range(256))
+
+class HexViewerModel(QAbstractTableModel):
+    """
+    Модель HEX-просмотрщика: смещение, HEX и ASCII по BYTES_PER_ROW байтов в строке.
+    
+    Хранит ссылку на буфер результата и форматирует строку только при
+    запросе ее представлением, поэтому стоимость не зависит от размера буфера.
+    """
+    
+    BYTES_PER_ROW = 16
+    HEADERS = ("Смещение", "HEX", "ASCII")
+    
+    def __init__(self, data=b''):
+        super().__init__()
+        self.buffer = memoryview(data)
+    
+    def set_buffer(self, data):
+        """Заменяет отображаемый буфер"""
+        self.beginResetModel()
+        self.buffer = memoryview(data)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return -(-len(self.buffer) // self.BYTES_PER_ROW)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        offset = index.row() * self.BYTES_PER_ROW
+        if index.column() == 0:
+            return f'{offset:08x}'
+        chunk = bytes(self.buffer[offset:offset + self.BYTES_PER_ROW])
+        if index.column() == 1:
+            return chunk.hex(' ')
+        return chunk.translate(ASCII_TABLE).decode('ascii')
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+class HexViewer(QTableView):
+    """
+    Представление для HexViewerModel с фиксированной высотой строк.
+    
+    Размеры строк и столбцов задаются по метрикам шрифта, а не по
+    содержимому, поэтому прокрутка не требует обхода всех строк.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.hex_model = HexViewerModel()
+        self.setModel(self.hex_model)
+        font = QFont("Courier", 9)
+        self.setFont(font)
+        metrics = QFontMetricsF(font)
+        
+        rows = self.verticalHeader()
+        rows.hide()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(int(metrics.height()) + 4)
+        
+        columns = self.horizontalHeader()
+        columns.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        per_row = HexViewerModel.BYTES_PER_ROW
+        for column, chars in enumerate((8, 3 * per_row - 1, per_row)):
+            columns.resizeSection(column, int(metrics.horizontalAdvance('0' * chars)) + 16)
+        columns.setStretchLastSection(True)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+    
+    def set_buffer(self, data):
+        """Отображает буфер data"""
+        self.hex_model.set_buffer(data)
+    
+    def keyPressEvent(self, event):
+        """Копирует выделенные строки в буфер обмена в виде HEX-строки"""
+        if not event.matches(QKeySequence.StandardKey.Copy):
+            super().keyPressEvent(event)
+            return
+        rows = self.selectionModel().selectedRows()
+        if not rows:
+            return
+        first = min(index.row() for index in rows)
+        last = max(index.row() for index in rows)
+        per_row = HexViewerModel.BYTES_PER_ROW
+        chunk = self.hex_model.buffer[first * per_row:(last + 1) * per_row]
+        QGuiApplication.clipboard().setText(chunk.hex())
+
+class CryptCancelled(Exception):
+    """Вычисление прервано пользователем"""
+
+class ResultCache:
+    """
+    Сохраненные результаты вычислений с вытеснением давно не использованных.
+    
+    Ключ - (хэш исходного блока, ключ, число раундов, режим), значение -
+    кортеж (результат, текст для поля вывода, FeistelVisualizer) с готовыми
+    состояниями и текстами раундов. Повторное вычисление с теми же
+    параметрами сразу отображается по сохраненному визуализатору. Записи
+    учитываются в бюджете памяти (CacheBudget), общем с кэшем состояний
+    раундов, и вытесняются вместе с его цепочками.
+    """
+    
+    def __init__(self, budget=None):
+        self.budget = shared_budget if budget is None else budget
+        self.entries = {}
+    
+    @staticmethod
+    def make_key(block, key, rounds, decrypt):
+        """Формирует ключ записи; блок представлен хэшем, а не копией"""
+        digest = hashlib.blake2b(block, digest_size=16).digest()
+        return digest, len(block), bytes(key), rounds, decrypt
+    
+    def get(self, cache_key):
+        """Возвращает сохраненный кортеж результата или None"""
+        with self.budget.lock:
+            payload = self.entries.get(cache_key)
+            if payload is not None:
+                self.budget.touch(self, cache_key)
+            return payload
+    
+    def put(self, cache_key, payload):
+        """Сохраняет кортеж результата, вытесняя старые записи сверх бюджета"""
+        _, result_text, visualizer = payload
+        # Результат - последнее состояние визуализации и учтен в nbytes
+        size = sys.getsizeof(result_text) + visualizer.nbytes()
+        with self.budget.lock:
+            if self.budget.charge(self, cache_key, size):
+                self.entries[cache_key] = payload
+            else:
+                self.evict(cache_key)
+    
+    def evict(self, cache_key):
+        """Удаляет запись; вызывается бюджетом при вытеснении"""
+        self.entries.pop(cache_key, None)
+
+class CryptWorker(QObject):
+    """
+    Выполняет шифрование/дешифрование и подготовку визуализации в фоновом потоке.
+    
+    Объект переносится в QThread; результаты передаются сигналами, а
+    элементы сцены создаются в потоке GUI по готовым состояниям раундов.
+    """
+    
+    # Номер завершенного раунда и общее число раундов
+    progress = pyqtSignal(int, int)
+    # Кортеж (результат, текст для поля вывода, FeistelVisualizer)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    
+    def __init__(self, block, key, rounds, decrypt, render_mode=RENDER_TEXT, cache=None):
+        super().__init__()
+        self.block = block
+        self.key = key
+        self.rounds = rounds
+        self.decrypt = decrypt
+        self.render_mode = render_mode
+        # ResultCache для повторных вычислений или None
+        self.cache = cache
+        self._cancel = threading.Event()
+    
+    def cancel(self):
+        """Запрашивает прерывание; вызывается из потока GUI"""
+        self._cancel.set()
+    
+    def is_cancelled(self):
+        """Возвращает True, если прерывание было запрошено"""
+        return self._cancel.is_set()
+    
+    def run(self):
+        """Выполняет вычисление; вызывается при запуске потока"""
+        def check():
+            if self._cancel.is_set():
+                raise CryptCancelled()
+        
+        def observer(index, state, round_key):
+            check()
+            # Сигнал отправляется не чаще одного раза на процент
+            if (index + 1) * 100 // self.rounds != index * 100 // self.rounds:
+                self.progress.emit(index + 1, self.rounds)
+        
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.block, self.key, self.rounds, self.decrypt)
+            payload = self.cache.get(cache_key)
+            if payload is not None:
+                self.progress.emit(self.rounds, self.rounds)
+                self.finished.emit(payload)
+                return
+        
+        try:
+            # Раунды, сохраненные в кэше состояний, не вычисляются повторно
+            visualizer = FeistelVisualizer(self.block, self.key, self.rounds, self.decrypt,
+                                           render_mode=self.render_mode, observer=observer)
+            self.progress.emit(self.rounds, self.rounds)
+            result_block = visualizer.states[-1][1]
+            visualizer.prepare(check)
+            result_text = format_result(result_block)
+        except CryptCancelled:
+            self.cancelled.emit()
+            return
+        except ValueError as error:
+            self.failed.emit(str(error))
+            return
+        payload = (result_block, result_text, visualizer)
+        if self.cache is not None:
+            self.cache.put(cache_key, payload)
+        self.finished.emit(payload)
+
+class FeistelNetworkGUI(QMainWindow):
+    """Основной класс графического интерфейса приложения"""
+    
+    def __init__(self):
+        super().__init__()
+        self.worker = None
+        self.worker_thread = None
+        # Отображаемая визуализация (раунды создаются по мере прокрутки)
+        self.visualizer = None
+        # Содержимое открытого файла (memoryview над mmap) или None для ввода текста
+        self.input_data = None
+        self.input_path = None
+        # Буфер последнего результата для сохранения в файл
+        self.result_block = None
+        # Результаты предыдущих вычислений
+        self.result_cache = ResultCache()
+        self.initUI()
+    
+    def initUI(self):
+        self.setWindowTitle('Сеть Фейстеля - Визуализация')
+        self.setGeometry(100, 100, 1000, 800)
+        
+        # Создаем центральный виджет и общий слой
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+        
+        # Создаем виджет с вкладками
+        self.tabs = QTabWidget()
+        main_layout.addWidget(self.tabs)
+        
+        # Вкладка шифрования/дешифрования
+        crypt_tab = QWidget()
+        self.tabs.addTab(crypt_tab, "Шифрование/Дешифрование")
+        
+        # Разделим вкладку на две части: контроли и визуализация
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        crypt_layout = QVBoxLayout(crypt_tab)
+        crypt_layout.addWidget(splitter)
+        
+        # Контейнер для элементов управления
+        controls_widget = QWidget()
+        controls_layout = QGridLayout(controls_widget)
+        splitter.addWidget(controls_widget)
+        
+        # Поле ввода текста
+        controls_layout.addWidget(QLabel("Исходный текст:"), 0, 0)
+        self.text_input = QPlainTextEdit()
+        self.text_input.setPlaceholderText("Введите текст для шифрования/дешифрования")
+        self.text_input.setPlainText("leshaartamonovdvoeshnik")
+        controls_layout.addWidget(self.text_input, 0, 1, 1, 3)
+        
+        # Работа с файлами: ввод из файла и сохранение результата
+        file_layout = QVBoxLayout()
+        self.input_format_input = QComboBox()
+        for input_format, title in INPUT_FORMATS.items():
+            self.input_format_input.addItem(title, input_format)
+        file_layout.addWidget(self.input_format_input)
+        self.open_button = QPushButton("Открыть файл…")
+        self.open_button.clicked.connect(self.open_file_action)
+        file_layout.addWidget(self.open_button)
+        self.close_file_button = QPushButton("Ввести текст")
+        self.close_file_button.setEnabled(False)
+        self.close_file_button.clicked.connect(self.close_file)
+        file_layout.addWidget(self.close_file_button)
+        self.save_button = QPushButton("Сохранить результат…")
+        self.save_button.setEnabled(False)
+        self.save_button.clicked.connect(self.save_result_action)
+        file_layout.addWidget(self.save_button)
+        file_layout.addStretch()
+        controls_layout.addLayout(file_layout, 0, 4)
+        
+        # Поле ввода ключа
+        controls_layout.addWidget(QLabel("Ключ:"), 1, 0)
+        self.key_input = QLineEdit()
+        self.key_input.setPlaceholderText("Введите ключ")
+        self.key_input.setText("nezachet")
+        controls_layout.addWidget(self.key_input, 1, 1)
+        
+        # Выбор количества раундов
+        controls_layout.addWidget(QLabel("Раунды:"), 1, 2)
+        self.rounds_input = QSpinBox()
+        self.rounds_input.setRange(1, MAX_ROUNDS)
+        self.rounds_input.setValue(10)
+        controls_layout.addWidget(self.rounds_input, 1, 3)
+        
+        # Кнопки
+        self.encrypt_button = QPushButton("Зашифровать")
+        self.encrypt_button.clicked.connect(self.encrypt_action)
+        controls_layout.addWidget(self.encrypt_button, 2, 1)
+        
+        self.decrypt_button = QPushButton("Дешифровать")
+        self.decrypt_button.clicked.connect(self.decrypt_action)
+        controls_layout.addWidget(self.decrypt_button, 2, 2)
+        
+        self.cancel_button = QPushButton("Отмена")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_action)
+        controls_layout.addWidget(self.cancel_button, 2, 3)
+        
+        # Индикатор выполнения раундов
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        controls_layout.addWidget(self.progress_bar, 3, 1, 1, 3)
+        
+        # Поле вывода результата
+        controls_layout.addWidget(QLabel("Результат:"), 4, 0)
+        result_widget = QWidget()
+        result_layout = QVBoxLayout(result_widget)
+        result_layout.setContentsMargins(0, 0, 0, 0)
+        self.result_label = QLabel()
+        self.result_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        result_layout.addWidget(self.result_label)
+        self.result_view = HexViewer()
+        result_layout.addWidget(self.result_view)
+        controls_layout.addWidget(result_widget, 4, 1, 1, 3)
+        
+        # Графическая сцена для визуализации
+        self.scene = QGraphicsScene()
+        self.view = ZoomableGraphicsView(self.scene)
+        splitter.addWidget(self.view)
+        
+        # Добавляем панель инструментов для масштабирования
+        self.create_zoom_toolbar()
+        
+        # Устанавливаем начальные размеры сплиттера
+        splitter.setSizes([200, 600])
+        
+        # Вкладка "О программе"
+        about_tab = QWidget()
+        self.tabs.addTab(about_tab, "О программе")
+        
+        about_layout = QVBoxLayout(about_tab)
+        about_text = QTextEdit()
+        about_text.setReadOnly(True)
+        about_text.setHtml("""
+        <h1>Визуализация работы сети Фейстеля</h1>
+        <p>Данное приложение демонстрирует принцип работы сети Фейстеля - 
+        распространенной схемы построения блочных шифров.</p>
+        
+        <h2>Принцип работы:</h2>
+        <ol>
+            <li>Входной блок данных делится на две равные части: левую (L) и правую (R).</li>
+            <li>В каждом раунде шифрования к правой части применяется функция преобразования F с использованием ключа раунда.</li>
+            <li>Результат операции F XOR-ится с левой частью, формируя новую правую часть.</li>
+            <li>Старая правая часть становится новой левой частью.</li>
+            <li>После последнего раунда выполняется финальная перестановка - обмен левой и правой частей местами.</li>
+        </ol>
+        
+        <h2>Особенности:</h2>
+        <ul>
+            <li>Дешифрование выполняется тем же алгоритмом, но с обратным порядком ключей.</li>
+            <li>Количество раундов влияет на криптостойкость шифра.</li>
+            <li>Функция F может различаться в разных реализациях шифров на основе сети Фейстеля.</li>
+        </ul>
+        """)
+        about_layout.addWidget(about_text)
+    
+    def create_zoom_toolbar(self):
+        """Создает панель инструментов для управления масштабом"""
+        zoom_toolbar = QToolBar("Масштаб")
+        self.addToolBar(Qt.ToolBarArea.TopToolBarArea, zoom_toolbar)
+        
+        # Кнопка "Увеличить"
+        zoom_in_action = QAction("Увеличить (+)", self)
+        zoom_in_action.triggered.connect(self.view.zoomIn)
+        zoom_toolbar.addAction(zoom_in_action)
+        
+        # Кнопка "Уменьшить"
+        zoom_out_action = QAction("Уменьшить (-)", self)
+        zoom_out_action.triggered.connect(self.view.zoomOut)
+        zoom_toolbar.addAction(zoom_out_action)
+        
+        # Кнопка "Сбросить масштаб"
+        reset_zoom_action = QAction("Сбросить масштаб (100%)", self)
+        reset_zoom_action.triggered.connect(self.view.resetZoom)
+        zoom_toolbar.addAction(reset_zoom_action)
+        
+        # Кнопка "Вписать в окно"
+        fit_action = QAction("Вписать в окно", self)
+        fit_action.triggered.connect(self.view.fitInView)
+        zoom_toolbar.addAction(fit_action)
+        
+        # Выбор режима отображения блоков
+        zoom_toolbar.addSeparator()
+        self.render_mode_input = QComboBox()
+        for mode, title in RENDER_MODES.items():
+            self.render_mode_input.addItem(title, mode)
+        self.render_mode_input.currentIndexChanged.connect(self.render_mode_changed)
+        zoom_toolbar.addWidget(self.render_mode_input)
+    
+    def render_mode_changed(self):
+        """Перерисовывает текущую визуализацию в выбранном режиме"""
+        if self.visualizer is not None:
+            self.visualizer.set_render_mode(self.render_mode_input.currentData())
+    
+    def encrypt_action(self):
+        """Обработчик нажатия кнопки 'Зашифровать'"""
+        self.process_data(False)
+    
+    def decrypt_action(self):
+        """Обработчик нажатия кнопки 'Дешифровать'"""
+        self.process_data(True)
+    
+    def cancel_action(self):
+        """Обработчик нажатия кнопки 'Отмена'"""
+        if self.worker is not None:
+            self.worker.cancel()
+    
+    def open_file_action(self):
+        """Обработчик нажатия кнопки 'Открыть файл…'"""
+        path, _ = QFileDialog.getOpenFileName(self, "Открыть файл")
+        if path:
+            self.open_file(path)
+    
+    def open_file(self, path):
+        """
+        Использует содержимое файла в качестве исходных данных.
+        
+        Файл отображается в память и передается в ядро без чтения в строку;
+        в поле ввода показывается только начало файла.
+        """
+        try:
+            data = map_file(path)
+        except OSError as error:
+            self.show_message(f"Ошибка: {error}")
+            return
+        self.input_data = data
+        self.input_path = path
+        preview = bytes(data[:INPUT_PREVIEW_BYTES]).decode('utf-8', errors='replace')
+        if len(data) > INPUT_PREVIEW_BYTES:
+            preview += "…"
+        self.text_input.setPlainText(preview)
+        self.text_input.setReadOnly(True)
+        self.input_format_input.setEnabled(False)
+        self.close_file_button.setEnabled(True)
+        self.show_message(f"Файл: {path} ({len(data)} байт)")
+    
+    def close_file(self):
+        """Возвращает ввод исходных данных в текстовое поле"""
+        self.input_data = None
+        self.input_path = None
+        self.text_input.clear()
+        self.text_input.setReadOnly(False)
+        self.input_format_input.setEnabled(True)
+        self.close_file_button.setEnabled(False)
+    
+    def save_result_action(self):
+        """Обработчик нажатия кнопки 'Сохранить результат…'"""
+        if self.result_block is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Сохранить результат")
+        if not path:
+            return
+        try:
+            save_buffer(path, self.result_block)
+        except OSError as error:
+            self.show_message(f"Ошибка: {error}")
+    
+    def input_block(self):
+        """
+        Возвращает исходный блок: содержимое открытого файла или поля ввода
+        в выбранном формате (INPUT_FORMATS).
+        
+        Блок нечетной длины дополняется нулевым байтом, как в pad_block; для
+        файла только в этом случае его содержимое копируется.
+        """
+        if self.input_data is not None:
+            block = self.input_data
+        else:
+            block = decode_input(self.text_input.toPlainText(),
+                                 self.input_format_input.currentData())
+        if len(block) % 2 != 0:
+            return bytes(block) + b'\x00'
+        return block
+    
+    def process_data(self, decrypt=False):
+        """
+        Запускает шифрование/дешифрование в фоновом потоке.
+        
+        Пока вычисление идет, окно остается отзывчивым: прогресс раундов
+        отображается индикатором, а кнопка 'Отмена' прерывает вычисление.
+        """
+        if self.worker is not None:
+            return
+        
+        # Получаем данные из полей ввода
+        try:
+            block = self.input_block()
+        except ValueError as error:
+            self.show_message(f"Ошибка: {error}")
+            return
+        key = self.key_input.text()
+        rounds = self.rounds_input.value()
+        
+        if not block or not key:
+            self.show_message("Ошибка: Пожалуйста, введите текст и ключ")
+            return
+        
+        # Преобразуем в формат для обработки
+        key_data = key.encode('utf-8')
+        
+        self.worker = CryptWorker(block, key_data, rounds, decrypt,
+                                  self.render_mode_input.currentData(), self.result_cache)
+        self.worker_thread = QThread(self)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.cancelled.connect(self.on_cancelled)
+        
+        self.set_busy(True, rounds)
+        self.worker_thread.start()
+    
+    def set_busy(self, busy, rounds=0):
+        """Переключает кнопки и индикатор между режимами ожидания и вычисления"""
+        self.encrypt_button.setEnabled(not busy)
+        self.decrypt_button.setEnabled(not busy)
+        self.open_button.setEnabled(not busy)
+        self.input_format_input.setEnabled(not busy and self.input_data is None)
+        self.close_file_button.setEnabled(not busy and self.input_data is not None)
+        self.save_button.setEnabled(not busy and self.result_block is not None)
+        self.cancel_button.setEnabled(busy)
+        if busy:
+            self.progress_bar.setRange(0, rounds)
+            self.progress_bar.setValue(0)
+    
+    def stop_worker(self):
+        """Завершает фоновый поток после окончания вычисления"""
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        self.worker_thread.deleteLater()
+        self.worker.deleteLater()
+        self.worker = None
+        self.worker_thread = None
+        self.set_busy(False)
+    
+    def show_message(self, message):
+        """Показывает сообщение вместо результата"""
+        self.result_label.setText(message)
+        self.result_block = None
+        self.save_button.setEnabled(False)
+        self.result_view.set_buffer(b'')
+    
+    def on_progress(self, done, total):
+        """Обновляет индикатор выполнения раундов"""
+        self.progress_bar.setValue(done)
+    
+    def on_finished(self, payload):
+        """Отображает результат и строит сцену по готовым состояниям раундов"""
+        result_block, result_text, visualizer = payload
+        if self.worker.is_cancelled():
+            # Отмена запрошена, когда последний раунд уже был вычислен
+            self.on_cancelled()
+            return
+        self.result_block = result_block
+        self.stop_worker()
+        self.result_label.setText(result_text)
+        self.result_view.set_buffer(result_block)
+        
+        # Элементы сцены создаются только в потоке GUI и только для видимых раундов
+        if self.visualizer is not None:
+            self.visualizer.detach()
+        self.visualizer = visualizer
+        # Сохраненный визуализатор мог быть построен в другом режиме отображения
+        visualizer.render_mode = self.render_mode_input.currentData()
+        visualizer.attach(self.scene, self.view)
+        
+        # Подгоняем вид для отображения всей сцены; длинную сцену - только по ширине
+        if visualizer.rounds <= FIT_ROUNDS:
+            self.view.fitInView()
+        else:
+            self.view.fitWidth()
+    
+    def on_failed(self, message):
+        """Отображает ошибку вычисления"""
+        self.stop_worker()
+        self.show_message(f"Ошибка: {message}")
+    
+    def on_cancelled(self):
+        """Сообщает о прерванном вычислении"""
+        self.stop_worker()
+        self.progress_bar.setValue(0)
+        self.show_message("Вычисление отменено")
+    
+    def closeEvent(self, event):
+        """Прерывает фоновое вычисление и отключает визуализацию при закрытии окна"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+        # Иначе сигнал visible_rect_changed при разрушении вида обратится к удаленной сцене
+        if self.visualizer is not None:
+            self.visualizer.detach()
+            self.visualizer = None
+        super().closeEvent(event)
@@ -0,0 +1,267 @@
+"""
+Шифрование файлов на диске через отображение в память (mmap).
+
+Раунды сети Фейстеля выполняются прямо над срезами memoryview
+отображенного файла, без чтения данных в списки или строки. Файл
+отображается окнами фиксированного размера, поэтому пиковый объем
+используемой памяти не зависит от размера файла.
+
+Результат в файл рядом (encrypt_file/decrypt_file) совпадает с
+modes.encrypt/modes.decrypt. При шифровании на месте
+(encrypt_file_inplace/decrypt_file_inplace) формат тот же, но без IV в
+начале файла: для CBC и CTR вектор инициализации передается отдельно.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+
+from feistel import get_engine, keys_gen_bytes, pad_message, unpad_message
+from modes import DEFAULT_BLOCK_SIZE, check_block_size, check_mode
+from stream import DEFAULT_CHUNK_SIZE, make_processor
+
+# Размер окна отображения файла
+DEFAULT_WINDOW_SIZE = 16 << 20
+
+def _aligned(size, block_size):
+    """Округляет size вниз до кратного block_size (но не меньше одного блока)"""
+    return max(size // block_size, 1) * block_size
+
+@contextmanager
+def _mapped(fileobj, offset, size, writable):
+    """
+    Отображает size байтов файла, начиная с offset, и возвращает memoryview.
+
+    Смещение mmap должно быть кратно ALLOCATIONGRANULARITY, поэтому
+    отображение начинается с ближайшей выровненной позиции.
+    """
+    delta = offset % mmap.ALLOCATIONGRANULARITY
+    access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+    mapping = mmap.mmap(fileobj.fileno(), size + delta, access=access, offset=offset - delta)
+    view = memoryview(mapping)[delta:delta + size]
+    try:
+        yield view
+    finally:
+        view.release()
+        if writable:
+            mapping.flush()
+        mapping.close()
+
+def _crypt_view(out, data, process, chunk_size):
+    """Обрабатывает data порциями и записывает результат в out"""
+    for offset in range(0, len(data), chunk_size):
+        out[offset:offset + chunk_size] = process(data[offset:offset + chunk_size])
+
+def _crypt_range(src, src_offset, dst, dst_offset, length, process, block_size,
+                 window_size, chunk_size):
+    """
+    Обрабатывает length байтов src окнами отображения и записывает их в dst.
+
+    Если src и dst - один и тот же файл с тем же смещением, данные
+    обрабатываются на месте через одно отображение.
+    """
+    window_size = _aligned(window_size, block_size)
+    chunk_size = _aligned(chunk_size, block_size)
+    in_place = src is dst and src_offset == dst_offset
+    for start in range(0, length, window_size):
+        size = min(window_size, length - start)
+        if in_place:
+            with _mapped(dst, dst_offset + start, size, True) as view:
+                _crypt_view(view, view, process, chunk_size)
+        else:
+            with _mapped(src, src_offset + start, size, False) as data, \
+                 _mapped(dst, dst_offset + start, size, True) as out:
+                _crypt_view(out, data, process, chunk_size)
+
+def _unpad_tail(fileobj, length, block_size):
+    """Снимает дополнение с последнего блока файла и возвращает новую длину"""
+    fileobj.seek(length - block_size)
+    tail = unpad_message(fileobj.read(block_size))
+    return length - block_size + len(tail)
+
+def _check_iv(iv, block_size):
+    """Проверяет вектор инициализации и возвращает его в виде bytes"""
+    iv = bytes(iv)
+    if len(iv) != block_size:
+        raise ValueError("Длина IV должна совпадать с размером блока")
+    return iv
+
+def encrypt_file(src_path, dst_path, key, rounds, mode='ecb', iv=None,
+                 block_size=DEFAULT_BLOCK_SIZE, engine='int',
+                 window_size=DEFAULT_WINDOW_SIZE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Шифрует файл src_path в заранее выделенный файл dst_path через mmap.
+
+    Args:
+        src_path: Путь к открытому тексту
+        dst_path: Путь к файлу результата (перезаписывается)
+        key: Ключ шифрования (bytes)
+        rounds: Количество раундов шифрования
+        mode: Режим из MODES
+        iv: Вектор инициализации для CBC и CTR (случайный, если не задан)
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        window_size: Размер окна отображения в байтах
+        chunk_size: Размер порции обработки в байтах
+
+    Returns:
+        Размер зашифрованного файла
+    """
+    check_mode(mode)
+    check_block_size(block_size)
+    get_engine(engine)
+    keys = keys_gen_bytes(key, False, rounds, block_size // 2)
+    if mode != 'ecb':
+        iv = _check_iv(os.urandom(block_size) if iv is None else iv, block_size)
+    header = 0 if mode == 'ecb' else block_size
+    process = make_processor(mode, keys, block_size, engine, iv, False)
+
+    with open(src_path, 'rb') as src, open(dst_path, 'w+b') as dst:
+        length = os.fstat(src.fileno()).st_size
+        # CTR сохраняет длину, остальные режимы дополняют последний блок
+        body = length if mode == 'ctr' else length - length % block_size
+        total = header + (length if mode == 'ctr' else body + block_size)
+        dst.truncate(total)
+        if header:
+            dst.write(iv)
+        _crypt_range(src, 0, dst, header, body, process, block_size,
+                     window_size, chunk_size)
+        if mode != 'ctr':
+            src.seek(body)
+            dst.seek(header + body)
+            dst.write(process(pad_message(src.read(), block_size)))
+    return total
+
+def decrypt_file(src_path, dst_path, key, rounds, mode='ecb',
+                 block_size=DEFAULT_BLOCK_SIZE, engine='int',
+                 window_size=DEFAULT_WINDOW_SIZE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Дешифрует файл, созданный encrypt_file или modes.encrypt, через mmap.
+
+    Args:
+        src_path: Путь к шифротексту
+        dst_path: Путь к файлу результата (перезаписывается)
+        key: Ключ шифрования (bytes)
+        rounds: Количество раундов шифрования
+        mode: Режим из MODES
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        window_size: Размер окна отображения в байтах
+        chunk_size: Размер порции обработки в байтах
+
+    Returns:
+        Размер расшифрованного файла
+    """
+    check_mode(mode)
+    check_block_size(block_size)
+    get_engine(engine)
+    # CTR всегда использует ключи шифрования для получения гаммы
+    keys = keys_gen_bytes(key, mode != 'ctr', rounds, block_size // 2)
+    header = 0 if mode == 'ecb' else block_size
+
+    with open(src_path, 'rb') as src, open(dst_path, 'w+b') as dst:
+        length = os.fstat(src.fileno()).st_size - header
+        if length < 0:
+            raise ValueError("Шифротекст короче IV")
+        if mode != 'ctr' and (length == 0 or length % block_size != 0):
+            raise ValueError("Длина шифротекста не кратна размеру блока")
+        iv = src.read(header) if header else None
+        process = make_processor(mode, keys, block_size, engine, iv, True)
+
+        dst.truncate(length)
+        _crypt_range(src, header, dst, 0, length, process, block_size,
+                     window_size, chunk_size)
+        if mode != 'ctr':
+            length = _unpad_tail(dst, length, block_size)
+            dst.truncate(length)
+    return length
+
+def encrypt_file_inplace(path, key, rounds, mode='ecb', iv=None,
+                         block_size=DEFAULT_BLOCK_SIZE, engine='int',
+                         window_size=DEFAULT_WINDOW_SIZE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Шифрует файл на месте через mmap.
+
+    В режимах ECB и CBC файл увеличивается на дополнение последнего блока,
+    в режиме CTR длина не меняется. IV в файл не записывается.
+
+    Args:
+        path: Путь к файлу
+        key: Ключ шифрования (bytes)
+        rounds: Количество раундов шифрования
+        mode: Режим из MODES
+        iv: Вектор инициализации (обязателен для CBC и CTR)
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        window_size: Размер окна отображения в байтах
+        chunk_size: Размер порции обработки в байтах
+
+    Returns:
+        Новый размер файла
+    """
+    check_mode(mode)
+    check_block_size(block_size)
+    get_engine(engine)
+    if mode != 'ecb':
+        if iv is None:
+            raise ValueError("Для шифрования на месте в режимах CBC и CTR нужен IV")
+        iv = _check_iv(iv, block_size)
+    keys = keys_gen_bytes(key, False, rounds, block_size // 2)
+    process = make_processor(mode, keys, block_size, engine, iv, False)
+
+    with open(path, 'r+b') as fileobj:
+        length = os.fstat(fileobj.fileno()).st_size
+        if mode != 'ctr':
+            # Дописываем дополнение, затем шифруем все блоки на месте
+            body = length - length % block_size
+            fileobj.seek(body)
+            tail = pad_message(fileobj.read(), block_size)
+            fileobj.seek(body)
+            fileobj.write(tail)
+            fileobj.flush()
+            length = body + len(tail)
+        _crypt_range(fileobj, 0, fileobj, 0, length, process, block_size,
+                     window_size, chunk_size)
+    return length
+
+def decrypt_file_inplace(path, key, rounds, mode='ecb', iv=None,
+                         block_size=DEFAULT_BLOCK_SIZE, engine='int',
+                         window_size=DEFAULT_WINDOW_SIZE, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Дешифрует на месте файл, созданный encrypt_file_inplace.
+
+    Args:
+        path: Путь к файлу
+        key: Ключ шифрования (bytes)
+        rounds: Количество раундов шифрования
+        mode: Режим из MODES
+        iv: Вектор инициализации (обязателен для CBC и CTR)
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        window_size: Размер окна отображения в байтах
+        chunk_size: Размер порции обработки в байтах
+
+    Returns:
+        Новый размер файла
+    """
+    check_mode(mode)
+    check_block_size(block_size)
+    get_engine(engine)
+    if mode != 'ecb':
+        if iv is None:
+            raise ValueError("Для дешифрования на месте в режимах CBC и CTR нужен IV")
+        iv = _check_iv(iv, block_size)
+    # CTR всегда использует ключи шифрования для получения гаммы
+    keys = keys_gen_bytes(key, mode != 'ctr', rounds, block_size // 2)
+    process = make_processor(mode, keys, block_size, engine, iv, True)
+
+    with open(path, 'r+b') as fileobj:
+        length = os.fstat(fileobj.fileno()).st_size
+        if mode != 'ctr' and (length == 0 or length % block_size != 0):
+            raise ValueError("Длина шифротекста не кратна размеру блока")
+        _crypt_range(fileobj, 0, fileobj, 0, length, process, block_size,
+                     window_size, chunk_size)
+        if mode != 'ctr':
+            length = _unpad_tail(fileobj, length, block_size)
+            fileobj.truncate(length)
+    return length
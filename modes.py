@@ -0,0 +1,265 @@
+"""
+Режимы работы блочного шифра (ECB, CBC, CTR) поверх сети Фейстеля.
+
+Сообщение делится на блоки фиксированного размера, каждый из которых
+обрабатывается так же, как crypt_block. Поэтому стоимость раунда не зависит
+от длины сообщения, а независимые блоки можно обрабатывать параллельно:
+шифрование и дешифрование ECB и CTR, а также дешифрование CBC делятся на
+сегменты, которые передаются исполнителю (concurrent.futures.Executor).
+Шифрование CBC по своей природе последовательно.
+"""
+
+import os
+from itertools import repeat
+
+from feistel import (BULK_ENGINES, bind_engine, keys_gen_bytes, pad_message, unpad_message,
+                     xor_bytes)
+
+MODES = ('ecb', 'cbc', 'ctr')
+
+# Размер блока по умолчанию
+DEFAULT_BLOCK_SIZE = 64
+
+# Размер сегмента, передаваемого одному исполнителю
+DEFAULT_SEGMENT_SIZE = 1 << 20
+
+def check_block_size(block_size):
+    """
+    Проверяет, что блок можно разделить на две равные половины.
+
+    Ключи раундов приводятся к длине половины блока (fit_key), поэтому
+    длина ключа не ограничена.
+
+    Args:
+        block_size: Размер блока в байтах
+    """
+    if block_size <= 0 or block_size % 2 != 0:
+        raise ValueError("Размер блока должен быть положительным четным числом")
+
+def check_mode(mode):
+    """Проверяет, что режим поддерживается"""
+    if mode not in MODES:
+        raise ValueError(f"Неизвестный режим: {mode}")
+
+def crypt_blocks_into(out, data, keys, block_size, engine):
+    """
+    Обрабатывает подряд идущие блоки data и записывает результат в out.
+
+    Движки из BULK_ENGINES получают все блоки одним вызовом, остальные
+    вызываются для каждого блока с ключами, привязанными один раз (bind_engine).
+
+    Args:
+        out: Записываемый буфер того же размера, что и data
+        data: Данные, длина которых кратна block_size
+        keys: Последовательность ключей раундов
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+    """
+    if engine in BULK_ENGINES:
+        out[:len(data)] = BULK_ENGINES[engine](data, keys, block_size)
+        return
+    run = bind_engine(engine, keys, block_size)
+    data = memoryview(data)
+    out = memoryview(out)
+    for offset in range(0, len(data), block_size):
+        out[offset:offset + block_size] = run(data[offset:offset + block_size])
+
+def ecb_segment(data, keys, block_size, engine):
+    """
+    Обрабатывает сегмент в режиме ECB (шифрование или дешифрование).
+
+    Args:
+        data: Данные, длина которых кратна block_size
+        keys: Ключи раундов для нужного направления
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+
+    Returns:
+        Результат типа bytes
+    """
+    out = bytearray(len(data))
+    crypt_blocks_into(out, data, keys, block_size, engine)
+    return bytes(out)
+
+def ctr_segment(data, keys, block_size, engine, iv, first_block):
+    """
+    Обрабатывает сегмент в режиме CTR, начиная с блока номер first_block.
+
+    Блок счетчика i равен (iv + i) mod 2^(8 * block_size) в порядке big-endian.
+    Шифрование и дешифрование совпадают; ключи всегда берутся для шифрования.
+
+    Args:
+        data: Данные произвольной длины
+        keys: Ключи раундов шифрования
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        iv: Начальное значение счетчика (block_size байтов)
+        first_block: Номер первого блока сегмента в сообщении
+
+    Returns:
+        Результат типа bytes той же длины, что и data
+    """
+    modulus = 1 << (8 * block_size)
+    counter = int.from_bytes(iv, 'big') + first_block
+    count = -(-len(data) // block_size)
+    counters = b''.join(((counter + i) % modulus).to_bytes(block_size, 'big')
+                        for i in range(count))
+    keystream = bytearray(count * block_size)
+    crypt_blocks_into(keystream, counters, keys, block_size, engine)
+    return xor_bytes(data, memoryview(keystream)[:len(data)])
+
+def cbc_encrypt_segment(data, keys, block_size, engine, prev):
+    """
+    Шифрует сегмент в режиме CBC; последний блок результата - сцепление для продолжения.
+
+    Args:
+        data: Данные, длина которых кратна block_size
+        keys: Ключи раундов шифрования
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        prev: Предыдущий блок шифротекста (или IV)
+
+    Returns:
+        Шифротекст типа bytes
+    """
+    run = bind_engine(engine, keys, block_size)
+    data = memoryview(data)
+    out = bytearray(len(data))
+    for offset in range(0, len(data), block_size):
+        prev = run(xor_bytes(data[offset:offset + block_size], prev))
+        out[offset:offset + block_size] = prev
+    return bytes(out)
+
+def cbc_decrypt_segment(data, keys, block_size, engine, prev):
+    """
+    Дешифрует сегмент в режиме CBC; блоки независимы друг от друга.
+
+    Args:
+        data: Шифротекст, длина которого кратна block_size
+        keys: Ключи раундов дешифрования
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        prev: Блок шифротекста перед сегментом (или IV)
+
+    Returns:
+        Открытый текст типа bytes
+    """
+    decrypted = ecb_segment(data, keys, block_size, engine)
+    chain = bytes(prev) + bytes(memoryview(data)[:len(data) - block_size])
+    return xor_bytes(decrypted, chain)
+
+def _segment_offsets(length, block_size, segment_size):
+    """Возвращает смещения сегментов, выровненных по границе блока, и их размер"""
+    step = max(segment_size // block_size, 1) * block_size
+    return range(0, length, step), step
+
+def _run_segments(executor, segment_size, block_size, data, func, *args, extra=None):
+    """
+    Применяет func ко всем сегментам data и склеивает результаты по порядку.
+
+    Args:
+        executor: Исполнитель concurrent.futures или None для работы в текущем потоке
+        extra: Функция offset -> кортеж дополнительных аргументов сегмента
+    """
+    if executor is None:
+        return func(data, *args, *(extra(0) if extra else ()))
+    offsets, step = _segment_offsets(len(data), block_size, segment_size)
+    segments = [bytes(data[offset:offset + step]) for offset in offsets]
+    columns = [repeat(arg) for arg in args]
+    if extra:
+        columns += list(zip(*[extra(offset) for offset in offsets]))
+    return b''.join(executor.map(func, segments, *columns))
+
+def encrypt(data, key, rounds, mode='ecb', iv=None, block_size=DEFAULT_BLOCK_SIZE,
+            engine='int', executor=None, segment_size=DEFAULT_SEGMENT_SIZE):
+    """
+    Шифрует сообщение в выбранном режиме.
+
+    В режимах ECB и CBC сообщение дополняется по ISO/IEC 7816-4. В режимах
+    CBC и CTR в начало результата записывается IV (случайный, если не задан).
+
+    Args:
+        data: Открытый текст (bytes-подобный объект)
+        key: Ключ шифрования (bytes)
+        rounds: Количество раундов шифрования
+        mode: Режим из MODES
+        iv: Вектор инициализации длины block_size или None
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        executor: Исполнитель для параллельной обработки сегментов или None
+        segment_size: Размер сегмента для исполнителя в байтах
+
+    Returns:
+        Шифротекст типа bytes
+    """
+    check_mode(mode)
+    check_block_size(block_size)
+    keys = keys_gen_bytes(key, False, rounds, block_size // 2)
+
+    if mode == 'ecb':
+        return _run_segments(executor, segment_size, block_size,
+                             pad_message(data, block_size), ecb_segment,
+                             keys, block_size, engine)
+
+    if iv is None:
+        iv = os.urandom(block_size)
+    if len(iv) != block_size:
+        raise ValueError("Длина IV должна совпадать с размером блока")
+    iv = bytes(iv)
+
+    if mode == 'cbc':
+        return iv + cbc_encrypt_segment(pad_message(data, block_size), keys,
+                                        block_size, engine, iv)
+    return iv + _run_segments(executor, segment_size, block_size, data, ctr_segment,
+                              keys, block_size, engine, iv,
+                              extra=lambda offset: (offset // block_size,))
+
+def decrypt(data, key, rounds, mode='ecb', block_size=DEFAULT_BLOCK_SIZE,
+            engine='int', executor=None, segment_size=DEFAULT_SEGMENT_SIZE):
+    """
+    Дешифрует сообщение, созданное encrypt с теми же параметрами.
+
+    Args:
+        data: Шифротекст (для CBC и CTR начинается с IV)
+        key: Ключ шифрования (bytes)
+        rounds: Количество раундов шифрования
+        mode: Режим из MODES
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        executor: Исполнитель для параллельной обработки сегментов или None
+        segment_size: Размер сегмента для исполнителя в байтах
+
+    Returns:
+        Открытый текст типа bytes
+    """
+    check_mode(mode)
+    check_block_size(block_size)
+    data = memoryview(data)
+
+    if mode == 'ctr':
+        if len(data) < block_size:
+            raise ValueError("Шифротекст короче IV")
+        iv = bytes(data[:block_size])
+        return _run_segments(executor, segment_size, block_size, data[block_size:],
+                             ctr_segment,
+                             keys_gen_bytes(key, False, rounds, block_size // 2),
+                             block_size, engine, iv,
+                             extra=lambda offset: (offset // block_size,))
+
+    if len(data) == 0 or len(data) % block_size != 0:
+        raise ValueError("Длина шифротекста не кратна размеру блока")
+    keys = keys_gen_bytes(key, True, rounds, block_size // 2)
+
+    if mode == 'ecb':
+        plain = _run_segments(executor, segment_size, block_size, data,
+                              ecb_segment, keys, block_size, engine)
+    else:
+        iv = bytes(data[:block_size])
+        body = data[block_size:]
+        if len(body) == 0:
+            raise ValueError("Шифротекст короче IV")
+        plain = _run_segments(executor, segment_size, block_size, body,
+                              cbc_decrypt_segment, keys, block_size, engine,
+                              extra=lambda offset: (
+                                  iv if offset == 0 else bytes(body[offset - block_size:offset]),))
+    return unpad_message(plain, block_size)
@@ -0,0 +1,208 @@
+"""
+Параллельное шифрование больших сообщений пулом процессов.
+
+Чистый Python-код раундов ограничен GIL, поэтому для загрузки всех ядер
+сообщение делится на непрерывные последовательности блоков, которые
+обрабатываются рабочими процессами. Входные и выходные данные передаются
+через multiprocessing.shared_memory, а не сериализуются в каждую задачу;
+расписание ключей передается каждому процессу один раз при запуске пула.
+
+Результат совпадает с modes.encrypt/modes.decrypt для тех же параметров.
+"""
+
+import multiprocessing
+import os
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from feistel import get_engine, keys_gen_bytes, pad_message, unpad_message
+from modes import (DEFAULT_BLOCK_SIZE, cbc_decrypt_segment, cbc_encrypt_segment,
+                   check_block_size, check_mode, crypt_blocks_into, ctr_segment)
+
+# Число последовательностей блоков на один процесс (для балансировки нагрузки)
+RUNS_PER_WORKER = 4
+
+# Размер порции, которую рабочий процесс обрабатывает за один шаг
+WORKER_CHUNK_SIZE = 1 << 16
+
+# Состояние рабочего процесса, заполняемое _init_worker
+_worker = {}
+
+def _attach(name):
+    """
+    Подключается к существующему сегменту разделяемой памяти без его отслеживания.
+
+    Сегментами владеет родительский процесс; без этого resource_tracker
+    удалил бы их при завершении рабочего процесса. В Python < 3.13
+    регистрация подавляется на время подключения: при запуске через fork
+    рабочий процесс использует трекер родителя, и отмена регистрации
+    удалила бы запись самого родителя.
+    """
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+def _init_worker(encrypt_keys, decrypt_keys, block_size, engine):
+    """Сохраняет расписание ключей и параметры в рабочем процессе"""
+    _worker['keys'] = {False: encrypt_keys, True: decrypt_keys}
+    _worker['block_size'] = block_size
+    _worker['engine'] = engine
+
+def _crypt_run(task):
+    """
+    Обрабатывает диапазон [start, end) разделяемого буфера на месте в выходном буфере.
+
+    Args:
+        task: Кортеж (in_name, out_name, start, end, mode, decrypt, iv)
+    """
+    in_name, out_name, start, end, mode, decrypt, iv = task
+    keys = _worker['keys'][decrypt and mode != 'ctr']
+    block_size = _worker['block_size']
+    engine = _worker['engine']
+    step = max(WORKER_CHUNK_SIZE // block_size, 1) * block_size
+
+    src = _attach(in_name)
+    dst = _attach(out_name)
+    try:
+        for offset in range(start, end, step):
+            stop = min(offset + step, end)
+            data = src.buf[offset:stop]
+            out = dst.buf[offset:stop]
+            if mode == 'ecb':
+                crypt_blocks_into(out, data, keys, block_size, engine)
+            elif mode == 'ctr':
+                out[:] = ctr_segment(data, keys, block_size, engine, iv,
+                                     offset // block_size)
+            else:
+                prev = iv if offset == 0 else bytes(src.buf[offset - block_size:offset])
+                out[:] = cbc_decrypt_segment(data, keys, block_size, engine, prev)
+            data.release()
+            out.release()
+    finally:
+        src.close()
+        dst.close()
+
+class ParallelCipher:
+    """
+    Пул процессов для шифрования/дешифрования больших сообщений одним ключом.
+
+    Использование:
+        with ParallelCipher(b'nezachet', 10) as cipher:
+            ciphertext = cipher.encrypt(data, mode='ctr')
+    """
+
+    def __init__(self, key, rounds, block_size=DEFAULT_BLOCK_SIZE, engine='int',
+                 workers=None):
+        check_block_size(block_size)
+        get_engine(engine)
+        self.key = bytes(key)
+        self.rounds = rounds
+        self.block_size = block_size
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+
+        # Ключи раундов приводятся к длине половины блока один раз
+        self.encrypt_keys = keys_gen_bytes(self.key, False, rounds, block_size // 2)
+        self.decrypt_keys = keys_gen_bytes(self.key, True, rounds, block_size // 2)
+        self.pool = multiprocessing.Pool(
+            self.workers, initializer=_init_worker,
+            initargs=(self.encrypt_keys, self.decrypt_keys, block_size, engine))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Завершает рабочие процессы"""
+        self.pool.close()
+        self.pool.join()
+
+    def _runs(self, length):
+        """Делит length байтов на непрерывные последовательности целых блоков"""
+        blocks = -(-length // self.block_size)
+        count = min(self.workers * RUNS_PER_WORKER, blocks) or 1
+        per_run = -(-blocks // count) * self.block_size
+        return [(start, min(start + per_run, length)) for start in range(0, length, per_run)]
+
+    def _process(self, data, mode, decrypt, iv=None):
+        """Обрабатывает data в рабочих процессах через разделяемую память"""
+        length = len(data)
+        if length == 0:
+            return b''
+        src = SharedMemory(create=True, size=length)
+        dst = SharedMemory(create=True, size=length)
+        try:
+            src.buf[:length] = data
+            tasks = [(src.name, dst.name, start, end, mode, decrypt, iv)
+                     for start, end in self._runs(length)]
+            for _ in self.pool.imap_unordered(_crypt_run, tasks):
+                pass
+            return bytes(dst.buf[:length])
+        finally:
+            src.close()
+            src.unlink()
+            dst.close()
+            dst.unlink()
+
+    def encrypt(self, data, mode='ecb', iv=None):
+        """
+        Шифрует сообщение; формат результата совпадает с modes.encrypt.
+
+        Шифрование CBC последовательно по своей природе и выполняется в
+        текущем процессе.
+
+        Args:
+            data: Открытый текст (bytes-подобный объект)
+            mode: Режим из MODES
+            iv: Вектор инициализации для CBC и CTR (случайный, если не задан)
+
+        Returns:
+            Шифротекст типа bytes
+        """
+        check_mode(mode)
+        if mode == 'ecb':
+            return self._process(pad_message(data, self.block_size), mode, False)
+
+        iv = os.urandom(self.block_size) if iv is None else bytes(iv)
+        if len(iv) != self.block_size:
+            raise ValueError("Длина IV должна совпадать с размером блока")
+        if mode == 'cbc':
+            return iv + cbc_encrypt_segment(pad_message(data, self.block_size),
+                                            self.encrypt_keys,
+                                            self.block_size, self.engine, iv)
+        return iv + self._process(data, mode, False, iv)
+
+    def decrypt(self, data, mode='ecb'):
+        """
+        Дешифрует сообщение, созданное encrypt или modes.encrypt.
+
+        Args:
+            data: Шифротекст (для CBC и CTR начинается с IV)
+            mode: Режим из MODES
+
+        Returns:
+            Открытый текст типа bytes
+        """
+        check_mode(mode)
+        data = memoryview(data)
+        iv = None
+        if mode != 'ecb':
+            if len(data) < self.block_size:
+                raise ValueError("Шифротекст короче IV")
+            iv = bytes(data[:self.block_size])
+            data = data[self.block_size:]
+        if mode == 'ctr':
+            return self._process(data, mode, True, iv)
+
+        if len(data) == 0 or len(data) % self.block_size != 0:
+            raise ValueError("Длина шифротекста не кратна размеру блока")
+        return unpad_message(self._process(data, mode, True, iv), self.block_size)
@@ -0,0 +1,179 @@
+"""
+Потоковое шифрование данных сети Фейстеля блоками фиксированного размера.
+
+Данные читаются порциями ограниченного размера, поэтому объем используемой
+памяти не зависит от размера входа. Каждый блок обрабатывается так же, как
+crypt_block с теми же ключом и числом раундов, а последний блок дополняется
+по ISO/IEC 7816-4 (pad_message). Поддерживаются режимы ECB, CBC и CTR
+из модуля modes.
+"""
+
+import os
+
+from feistel import get_engine, keys_gen_bytes, pad_message, unpad_message
+from modes import (DEFAULT_BLOCK_SIZE, cbc_decrypt_segment, cbc_encrypt_segment,
+                   check_block_size, check_mode, crypt_blocks_into, ctr_segment)
+
+# Размер порции чтения (кратен любому разумному размеру блока)
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+def _read_chunks(src, chunk_size):
+    """Читает поток порциями, пока он не закончится"""
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def _read_exact(src, size):
+    """Читает из потока ровно size байтов (или меньше, если поток закончился)"""
+    data = b''
+    while len(data) < size:
+        chunk = src.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+def make_processor(mode, keys, block_size, engine, iv, decrypt):
+    """
+    Создает функцию, обрабатывающую подряд идущие порции целых блоков.
+
+    Функция хранит между вызовами состояние режима: номер блока счетчика
+    для CTR и предыдущий блок шифротекста для CBC.
+    """
+    if mode == 'ecb':
+        def process(data):
+            out = bytearray(len(data))
+            crypt_blocks_into(out, data, keys, block_size, engine)
+            return out
+        return process
+
+    if mode == 'ctr':
+        position = 0
+        def process(data):
+            nonlocal position
+            out = ctr_segment(data, keys, block_size, engine, iv, position)
+            position += len(data) // block_size
+            return out
+        return process
+
+    prev = iv
+    def process(data):
+        nonlocal prev
+        if not data:
+            return b''
+        if decrypt:
+            out = cbc_decrypt_segment(data, keys, block_size, engine, prev)
+            prev = bytes(data[-block_size:])
+        else:
+            out = cbc_encrypt_segment(data, keys, block_size, engine, prev)
+            prev = out[-block_size:]
+        return out
+    return process
+
+def encrypt_stream(src, dst, key, rounds, block_size=DEFAULT_BLOCK_SIZE,
+                   engine='int', chunk_size=DEFAULT_CHUNK_SIZE, mode='ecb', iv=None):
+    """
+    Шифрует бинарный поток src и записывает результат в dst.
+
+    Результат совпадает с modes.encrypt для тех же параметров: в режимах
+    CBC и CTR поток начинается с IV, в режимах ECB и CBC последний блок
+    дополняется.
+
+    Args:
+        src: Файловый объект, открытый на чтение в бинарном режиме
+        dst: Файловый объект, открытый на запись в бинарном режиме
+        key: Ключ шифрования (bytes)
+        rounds: Количество раундов шифрования
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        chunk_size: Размер порции чтения в байтах
+        mode: Режим из MODES
+        iv: Вектор инициализации для CBC и CTR (случайный, если не задан)
+
+    Returns:
+        Количество записанных байтов
+    """
+    check_mode(mode)
+    check_block_size(block_size)
+    get_engine(engine)
+    keys = keys_gen_bytes(key, False, rounds, block_size // 2)
+    written = 0
+
+    if mode != 'ecb':
+        iv = os.urandom(block_size) if iv is None else bytes(iv)
+        if len(iv) != block_size:
+            raise ValueError("Длина IV должна совпадать с размером блока")
+        dst.write(iv)
+        written += len(iv)
+    process = make_processor(mode, keys, block_size, engine, iv, False)
+
+    pending = b''
+    for chunk in _read_chunks(src, chunk_size):
+        data = pending + chunk
+        usable = len(data) - len(data) % block_size
+        out = process(memoryview(data)[:usable])
+        dst.write(out)
+        written += len(out)
+        pending = data[usable:]
+
+    # CTR не требует дополнения; в остальных режимах дополняем последний блок
+    tail = process(pending if mode == 'ctr' else pad_message(pending, block_size))
+    dst.write(tail)
+    return written + len(tail)
+
+def decrypt_stream(src, dst, key, rounds, block_size=DEFAULT_BLOCK_SIZE,
+                   engine='int', chunk_size=DEFAULT_CHUNK_SIZE, mode='ecb'):
+    """
+    Дешифрует бинарный поток src, созданный encrypt_stream, и записывает результат в dst.
+
+    В режимах с дополнением последний блок удерживается до конца потока,
+    чтобы снять дополнение.
+
+    Args:
+        src: Файловый объект, открытый на чтение в бинарном режиме
+        dst: Файловый объект, открытый на запись в бинарном режиме
+        key: Ключ шифрования (bytes)
+        rounds: Количество раундов шифрования
+        block_size: Размер блока в байтах
+        engine: Имя движка из ENGINES
+        chunk_size: Размер порции чтения в байтах
+        mode: Режим из MODES
+
+    Returns:
+        Количество записанных байтов
+    """
+    check_mode(mode)
+    check_block_size(block_size)
+    get_engine(engine)
+    # CTR всегда использует ключи шифрования для получения гаммы
+    keys = keys_gen_bytes(key, mode != 'ctr', rounds, block_size // 2)
+
+    iv = None
+    if mode != 'ecb':
+        iv = _read_exact(src, block_size)
+        if len(iv) != block_size:
+            raise ValueError("Шифротекст короче IV")
+    process = make_processor(mode, keys, block_size, engine, iv, True)
+    # Последний блок нужен целиком для снятия дополнения
+    holdback = 0 if mode == 'ctr' else block_size
+
+    written = 0
+    pending = b''
+    for chunk in _read_chunks(src, chunk_size):
+        data = pending + chunk
+        usable = max(len(data) - len(data) % block_size - holdback, 0)
+        out = process(memoryview(data)[:usable])
+        dst.write(out)
+        written += len(out)
+        pending = data[usable:]
+
+    if mode == 'ctr':
+        tail = process(pending)
+    else:
+        if len(pending) != block_size:
+            raise ValueError("Длина шифротекста не кратна размеру блока")
+        tail = unpad_message(process(pending))
+    dst.write(tail)
+    return written + len(tail)
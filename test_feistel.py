@@ -0,0 +1,539 @@
+"""
+Тесты эквивалентности ядра сети Фейстеля.
+
+Все движки сравниваются с исходной реализацией на списках (ниже она
+воспроизведена без изменений), режимы работы - с круговым преобразованием,
+а потоковая, отображаемая в память, параллельная и пакетная обработка - с
+modes и crypt_block_bytes.
+
+Запуск:
+    python -m unittest test_feistel
+"""
+
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import batch
+import bench
+import mapped
+import modes
+import parallel
+import stream
+from feistel import (ENGINES, CompiledCipher, RoundTrace, bind_engine, bitslice_transpose,
+                     bitslice_untranspose, crypt_bitsliced, crypt_block, crypt_block_bytes,
+                     crypt_round, f_table, fit_key, get_key_schedule, keys_gen, keys_gen_bytes,
+                     pad_message, permute_bytes, permute_word, unpad_message)
+from feistel.engines import BITSLICE_CACHE_HALF, _affine_constant
+
+def reference_f(right, key):
+    """Исходная функция F: XOR с ключом (с дополнением нулями), инверсия и сдвиг"""
+    max_len = max(len(right), len(key))
+    mixed = [(right[i] if i < len(right) else 0) ^ (key[i] if i < len(key) else 0)
+             for i in range(max_len)]
+    return [((~x & 0xFF) << 1) & 0xFF for x in mixed]
+
+def reference_keys_gen(key, decrypt, rounds):
+    """Исходная генерация ключей раундов перестановкой permute_word"""
+    res = []
+    for i in range(rounds):
+        word = list(key)
+        for j in range(len(word)):
+            new_index = (j + i) % len(word)
+            word[j], word[new_index] = word[new_index], word[j]
+        res.append(word)
+    if decrypt:
+        res.reverse()
+    return res
+
+def reference_crypt_round(block, round_key):
+    """Исходный раунд crypt_round на списках целых чисел"""
+    left = list(block[:len(block)//2])
+    right = list(block[len(block)//2:])
+    fr = reference_f(right, round_key)
+    return right + [(left[i] if i < len(left) else 0) ^ (fr[i] if i < len(fr) else 0)
+                    for i in range(max(len(left), len(fr)))]
+
+def reference_crypt_block(block, key, decrypt, rounds):
+    """Исходная реализация crypt_block на списках целых чисел"""
+    block = list(block)
+    for round_key in reference_keys_gen(key, decrypt, rounds):
+        block = reference_crypt_round(block, round_key)
+    left = block[:len(block)//2]
+    right = block[len(block)//2:]
+    return right + left
+
+def random_bytes(rng, length):
+    """Возвращает воспроизводимые случайные байты"""
+    return bytes(rng.randrange(256) for _ in range(length))
+
+class EngineTest(unittest.TestCase):
+    """Все движки из ENGINES совпадают с исходной реализацией на списках"""
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def cases(self, count=200):
+        """Случайные (блок, ключ, режим, раунды), включая пустые и нечетные блоки"""
+        yield b'', b'key', False, 3
+        yield b'', b'', True, 2
+        yield b'abc', b'k', False, 4
+        for _ in range(count):
+            block = random_bytes(self.rng, self.rng.randrange(0, 40))
+            key = random_bytes(self.rng, self.rng.randrange(0, 30))
+            yield block, key, self.rng.random() < 0.5, self.rng.randrange(0, 12)
+
+    def test_round(self):
+        for block, key, _, _ in self.cases():
+            self.assertEqual(crypt_round(list(block), list(key)),
+                             reference_crypt_round(block, key))
+
+    def test_legacy_growth(self):
+        for block, key, decrypt, rounds in self.cases():
+            expected = reference_crypt_block(block, key, decrypt, rounds)
+            for engine in ENGINES:
+                with self.subTest(engine=engine, size=len(block), key=len(key), rounds=rounds):
+                    self.assertEqual(crypt_block(list(block), list(key), decrypt, rounds, engine),
+                                     expected)
+                    self.assertEqual(list(crypt_block_bytes(block, key, decrypt, rounds, engine,
+                                                            legacy_growth=True)), expected)
+
+    def test_fixed_length(self):
+        for block, key, decrypt, rounds in self.cases():
+            if len(block) % 2 != 0:
+                for engine in ENGINES:
+                    with self.assertRaises(ValueError):
+                        crypt_block_bytes(block, key, decrypt, rounds, engine)
+                continue
+            expected = crypt_block_bytes(block, key, decrypt, rounds, 'bytes')
+            self.assertEqual(len(expected), len(block))
+            if len(key) <= len(block) // 2:
+                # Без роста блока результат совпадает с исходной реализацией
+                self.assertEqual(list(expected),
+                                 reference_crypt_block(block, key, decrypt, rounds))
+            for engine in ENGINES:
+                with self.subTest(engine=engine, size=len(block), key=len(key), rounds=rounds):
+                    self.assertEqual(crypt_block_bytes(block, key, decrypt, rounds, engine),
+                                     expected)
+
+    def test_round_trip(self):
+        for block, key, _, rounds in self.cases(50):
+            if len(block) % 2 != 0:
+                continue
+            for engine in ENGINES:
+                encrypted = crypt_block_bytes(block, key, False, rounds, engine)
+                self.assertEqual(crypt_block_bytes(encrypted, key, True, rounds, engine), block)
+
+    def test_observer(self):
+        for block, key, decrypt, rounds in self.cases(50):
+            legacy_growth = len(block) % 2 != 0 or len(key) > len(block) // 2
+            expected = []
+            state = list(block)
+            for round_key in reference_keys_gen(key, decrypt, rounds):
+                state = reference_crypt_round(state, round_key)
+                expected.append(bytes(state))
+            for engine in ENGINES:
+                with self.subTest(engine=engine, size=len(block), key=len(key), rounds=rounds):
+                    trace = RoundTrace()
+                    result = crypt_block_bytes(block, key, decrypt, rounds, engine,
+                                               legacy_growth, trace)
+                    self.assertEqual(trace.states, expected)
+                    self.assertEqual(len(trace.round_keys), rounds)
+                    self.assertEqual(result, crypt_block_bytes(block, key, decrypt, rounds,
+                                                               engine, legacy_growth))
+
+    def test_f_table(self):
+        data = bytes(range(256))
+        for key_byte in (0, 1, 0x7F, 0x80, 0xFF):
+            self.assertEqual(list(data.translate(f_table(key_byte))),
+                             reference_f(list(data), [key_byte] * 256))
+
+    def test_fit_key(self):
+        # Длинный ключ сворачивается: байт i складывается с байтом i % length
+        self.assertEqual(fit_key(b'\x01\x02\x03\x04\x05', 2), b'\x07\x06')
+        self.assertEqual(fit_key(b'\x01\x02', 0), b'')
+        # Короткий ключ не дополняется: движки сами считают недостающие байты нулями
+        self.assertEqual(fit_key(b'\x01\x02', 8), b'\x01\x02')
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            crypt_block_bytes(b'abcd', b'k', False, 1, 'missing')
+
+class KeyScheduleTest(unittest.TestCase):
+    """Расписание ключей совпадает с исходной генерацией"""
+
+    def test_keys(self):
+        rng = random.Random(3)
+        for key_len in (0, 1, 2, 5, 8, 17):
+            key = random_bytes(rng, key_len)
+            for decrypt in (False, True):
+                expected = reference_keys_gen(key, decrypt, 12)
+                self.assertEqual(keys_gen(list(key), decrypt, 12), expected)
+                self.assertEqual([list(k) for k in keys_gen_bytes(key, decrypt, 12)], expected)
+
+    def test_permutation(self):
+        for length in range(20):
+            word = list(range(100, 100 + length))
+            for i, expected in enumerate(reference_keys_gen(word, False, 3 * length + 2)):
+                self.assertEqual(permute_word(word, i), expected)
+                self.assertEqual(permute_bytes(bytes(word), i), bytes(expected))
+
+    def test_shared(self):
+        schedule = get_key_schedule(b'nezachet', 7)
+        self.assertIs(get_key_schedule(bytearray(b'nezachet'), 7), schedule)
+        self.assertEqual(schedule.keys(True), schedule.keys(False)[::-1])
+
+    def test_fitted_keys(self):
+        schedule = get_key_schedule(b'nezachet', 7)
+        # Ключи не длиннее половины блока не копируются и не кэшируются
+        self.assertIs(schedule.fitted_keys(False, 8), schedule.encrypt_keys)
+        self.assertIs(schedule.fitted_keys(False, 1 << 20), schedule.encrypt_keys)
+        self.assertEqual(schedule.fitted_keys(True, 64), schedule.decrypt_keys)
+        self.assertEqual(schedule.fitted_keys(False, 3),
+                         tuple(fit_key(k, 3) for k in schedule.encrypt_keys))
+
+class CompiledCipherTest(unittest.TestCase):
+    """Свернутый в аффинное преобразование шифр совпадает с crypt_block_bytes"""
+
+    def test_cipher(self):
+        rng = random.Random(4)
+        for length in (2, 16, 64):
+            for rounds in (0, 1, 7, 100):
+                key = random_bytes(rng, length // 2 + 3)
+                encrypt = CompiledCipher(key, rounds, length)
+                decrypt = CompiledCipher(key, rounds, length, decrypt=True)
+                for _ in range(5):
+                    block = random_bytes(rng, length)
+                    encrypted = encrypt(block)
+                    self.assertEqual(encrypted, crypt_block_bytes(block, key, False, rounds))
+                    self.assertEqual(decrypt(encrypted), block)
+
+    def test_length(self):
+        for length in (0, 15):
+            with self.assertRaises(ValueError):
+                CompiledCipher(b'key', 3, length)
+        with self.assertRaises(ValueError):
+            CompiledCipher(b'key', 3, 16)(bytes(8))
+
+    def test_precomputed(self):
+        # Константа ключей вычисляется при создании, а не при каждом вызове
+        cipher = CompiledCipher(b'nezachet', 1000, 16)
+        lookups = _affine_constant.cache_info()
+        for block in (bytes(16), b'Feistel network!'):
+            self.assertEqual(cipher(block), crypt_block_bytes(block, b'nezachet', False, 1000))
+        self.assertEqual(_affine_constant.cache_info(), lookups)
+
+    def test_bind_engine(self):
+        keys = keys_gen_bytes(b'nezachet', False, 1000, 8)
+        run = bind_engine('compiled', keys, 16)
+        lookups = _affine_constant.cache_info()
+        message = bytes(range(256))
+        self.assertEqual(b''.join(run(message[i:i + 16]) for i in range(0, 256, 16)),
+                         modes.ecb_segment(message, keys, 16, 'int'))
+        self.assertEqual(_affine_constant.cache_info(), lookups)
+        # Один режим - одно свертывание ключей, а не одно на блок
+        modes.encrypt(message, b'nezachet', 1000, 'cbc', bytes(16), 16, 'compiled')
+        info = _affine_constant.cache_info()
+        self.assertEqual(info.hits + info.misses, lookups.hits + lookups.misses + 1)
+
+class BitsliceTest(unittest.TestCase):
+    """Обработка в битовых плоскостях совпадает с поблочным движком 'int'"""
+
+    def test_transpose(self):
+        rng = random.Random(5)
+        for block_size in (2, 16):
+            for count in (1, 3, 64):
+                data = random_bytes(rng, block_size * count)
+                planes = bitslice_transpose(data, block_size)
+                self.assertEqual(len(planes), 8 * block_size)
+                self.assertEqual(bitslice_untranspose(planes, count, block_size), data)
+
+    def test_crypt(self):
+        rng = random.Random(6)
+        for block_size in (2, 16, 64):
+            for count in (0, 1, 5, 100):
+                data = random_bytes(rng, block_size * count)
+                key = random_bytes(rng, block_size // 2 + 1)
+                for decrypt in (False, True):
+                    keys = keys_gen_bytes(key, decrypt, 9, block_size // 2)
+                    expected = b''.join(
+                        crypt_block_bytes(data[i:i + block_size], key, decrypt, 9, 'int')
+                        for i in range(0, len(data), block_size))
+                    self.assertEqual(crypt_bitsliced(data, keys, block_size), expected)
+
+    def test_long_half(self):
+        # Половина длиннее BITSLICE_CACHE_HALF: биты ключа не кэшируются
+        block_size = 2 * BITSLICE_CACHE_HALF + 2
+        data = random_bytes(random.Random(7), 2 * block_size)
+        keys = keys_gen_bytes(b'nezachet', False, 3, block_size // 2)
+        expected = b''.join(crypt_block_bytes(data[i:i + block_size], b'nezachet', False, 3)
+                            for i in (0, block_size))
+        self.assertEqual(crypt_bitsliced(data, keys, block_size), expected)
+
+class ModesTest(unittest.TestCase):
+    """Режимы работы и альтернативные способы обработки совпадают с modes"""
+
+    key = b'nezachet'
+    rounds = 5
+    block_size = 16
+
+    def setUp(self):
+        rng = random.Random(1)
+        self.messages = [random_bytes(rng, n) for n in (0, 1, 15, 16, 17, 100, 1000)]
+        self.iv = random_bytes(rng, self.block_size)
+
+    def encrypt(self, data, mode, engine='int'):
+        return modes.encrypt(data, self.key, self.rounds, mode, self.iv, self.block_size, engine)
+
+    def test_padding(self):
+        for message in self.messages:
+            padded = pad_message(message, self.block_size)
+            self.assertEqual(len(padded) % self.block_size, 0)
+            self.assertGreater(len(padded), len(message))
+            self.assertEqual(unpad_message(padded), message)
+        with self.assertRaises(ValueError):
+            unpad_message(bytes(self.block_size))
+
+    def test_ecb(self):
+        for message in self.messages:
+            padded = pad_message(message, self.block_size)
+            expected = b''.join(
+                crypt_block_bytes(padded[i:i + self.block_size], self.key, False, self.rounds)
+                for i in range(0, len(padded), self.block_size))
+            self.assertEqual(self.encrypt(message, 'ecb'), expected)
+
+    def test_round_trip(self):
+        for mode in modes.MODES:
+            for engine in ENGINES:
+                for message in self.messages:
+                    with self.subTest(mode=mode, engine=engine, size=len(message)):
+                        encrypted = self.encrypt(message, mode, engine)
+                        self.assertEqual(modes.decrypt(encrypted, self.key, self.rounds, mode,
+                                                       self.block_size, engine), message)
+
+    def test_long_key(self):
+        # Ключ длиннее половины блока сворачивается, и длина блока не меняется
+        key = bytes(range(1, 30))
+        for mode in modes.MODES:
+            encrypted = modes.encrypt(self.messages[-1], key, self.rounds, mode, self.iv,
+                                      self.block_size)
+            self.assertEqual(modes.decrypt(encrypted, key, self.rounds, mode, self.block_size),
+                             self.messages[-1])
+
+    def test_executor(self):
+        message = self.messages[-1]
+        with ThreadPoolExecutor(2) as executor:
+            for mode in modes.MODES:
+                encrypted = modes.encrypt(message, self.key, self.rounds, mode, self.iv,
+                                          self.block_size, executor=executor, segment_size=64)
+                self.assertEqual(encrypted, self.encrypt(message, mode))
+                self.assertEqual(modes.decrypt(encrypted, self.key, self.rounds, mode,
+                                               self.block_size, executor=executor,
+                                               segment_size=64), message)
+
+    def test_invalid(self):
+        for block_size in (0, 15, -2):
+            with self.assertRaises(ValueError):
+                modes.check_block_size(block_size)
+        with self.assertRaises(ValueError):
+            modes.check_mode('ofb')
+        with self.assertRaises(ValueError):
+            modes.encrypt(b'', self.key, self.rounds, 'cbc', b'short', self.block_size)
+        with self.assertRaises(ValueError):
+            stream.decrypt_stream(io.BytesIO(bytes(20)), io.BytesIO(), self.key, self.rounds,
+                                  self.block_size)
+
+    def test_zero_last_block(self):
+        # Байт 0x80 перед нулевым последним блоком не принимается за дополнение
+        data = self.encrypt(b'ab\x80' + bytes(2 * self.block_size - 3), 'ecb')
+        broken = data[:-self.block_size] + crypt_block_bytes(
+            bytes(self.block_size), self.key, False, self.rounds, 'int')
+        with self.assertRaises(ValueError):
+            modes.decrypt(broken, self.key, self.rounds, 'ecb', self.block_size)
+
+    def test_stream(self):
+        for mode in modes.MODES:
+            for message in self.messages:
+                with self.subTest(mode=mode, size=len(message)):
+                    expected = self.encrypt(message, mode)
+                    out = io.BytesIO()
+                    stream.encrypt_stream(io.BytesIO(message), out, self.key, self.rounds,
+                                          self.block_size, chunk_size=48, mode=mode,
+                                          iv=self.iv)
+                    self.assertEqual(out.getvalue(), expected)
+                    plain = io.BytesIO()
+                    stream.decrypt_stream(io.BytesIO(expected), plain, self.key, self.rounds,
+                                          self.block_size, chunk_size=48, mode=mode)
+                    self.assertEqual(plain.getvalue(), message)
+
+    def test_mapped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'src')
+            dst = os.path.join(tmp, 'dst')
+            plain = os.path.join(tmp, 'plain')
+            for mode in modes.MODES:
+                for message in self.messages:
+                    with self.subTest(mode=mode, size=len(message)):
+                        with open(src, 'wb') as fileobj:
+                            fileobj.write(message)
+                        mapped.encrypt_file(src, dst, self.key, self.rounds, mode, self.iv,
+                                            self.block_size, chunk_size=48)
+                        with open(dst, 'rb') as fileobj:
+                            self.assertEqual(fileobj.read(), self.encrypt(message, mode))
+                        mapped.decrypt_file(dst, plain, self.key, self.rounds, mode,
+                                            self.block_size, chunk_size=48)
+                        with open(plain, 'rb') as fileobj:
+                            self.assertEqual(fileobj.read(), message)
+
+    def test_mapped_inplace(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data')
+            for mode in modes.MODES:
+                for message in self.messages:
+                    with self.subTest(mode=mode, size=len(message)):
+                        expected = self.encrypt(message, mode)
+                        if mode != 'ecb':
+                            # IV при шифровании на месте в файл не записывается
+                            expected = expected[self.block_size:]
+                        with open(path, 'wb') as fileobj:
+                            fileobj.write(message)
+                        mapped.encrypt_file_inplace(path, self.key, self.rounds, mode, self.iv,
+                                                    self.block_size, chunk_size=48)
+                        with open(path, 'rb') as fileobj:
+                            self.assertEqual(fileobj.read(), expected)
+                        mapped.decrypt_file_inplace(path, self.key, self.rounds, mode, self.iv,
+                                                    self.block_size, chunk_size=48)
+                        with open(path, 'rb') as fileobj:
+                            self.assertEqual(fileobj.read(), message)
+
+    def test_parallel(self):
+        with parallel.ParallelCipher(self.key, self.rounds, self.block_size,
+                                     workers=2) as cipher:
+            for mode in modes.MODES:
+                for message in self.messages:
+                    with self.subTest(mode=mode, size=len(message)):
+                        expected = self.encrypt(message, mode)
+                        self.assertEqual(cipher.encrypt(message, mode, self.iv), expected)
+                        self.assertEqual(cipher.decrypt(expected, mode), message)
+
+    def test_parallel_tracker(self):
+        # Рабочие процессы не должны снимать с учета сегменты родителя
+        code = ("from parallel import ParallelCipher\n"
+                "for _ in range(2):\n"
+                "    with ParallelCipher(b'nezachet', 2, 16, workers=2) as cipher:\n"
+                "        cipher.encrypt(bytes(4096), 'ctr', bytes(16))\n")
+        process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(process.returncode, 0, process.stderr)
+        self.assertNotIn('Traceback', process.stderr)
+
+@unittest.skipIf(batch.np is None, "numpy не установлен")
+class BatchTest(unittest.TestCase):
+    """Пакетная обработка совпадает с crypt_block_bytes"""
+
+    def setUp(self):
+        self.rng = random.Random(2)
+
+    def test_crypt_blocks(self):
+        for block_len, key_len in ((16, 4), (16, 8), (16, 12), (7, 3), (0, 2)):
+            blocks = [random_bytes(self.rng, block_len) for _ in range(5)]
+            key = random_bytes(self.rng, key_len)
+            matrix = batch.np.frombuffer(b''.join(blocks), dtype=batch.np.uint8)
+            matrix = matrix.reshape(len(blocks), block_len)
+            for legacy_growth in (False, True):
+                if block_len % 2 != 0 and not legacy_growth:
+                    with self.assertRaises(ValueError):
+                        batch.crypt_blocks(matrix, key, False, 6)
+                    continue
+                for decrypt in (False, True):
+                    result = batch.crypt_blocks(matrix, key, decrypt, 6, legacy_growth)
+                    for row, block in zip(result, blocks):
+                        self.assertEqual(row.tobytes(), crypt_block_bytes(
+                            block, key, decrypt, 6, legacy_growth=legacy_growth))
+
+    def test_crypt_keys(self):
+        for block_len, key_len in ((16, 4), (16, 8), (16, 12), (7, 3), (0, 2)):
+            block = random_bytes(self.rng, block_len)
+            keys = [random_bytes(self.rng, key_len) for _ in range(5)]
+            matrix = batch.np.frombuffer(b''.join(keys), dtype=batch.np.uint8)
+            matrix = matrix.reshape(len(keys), key_len)
+            for legacy_growth in (False, True):
+                if block_len % 2 != 0 and not legacy_growth:
+                    with self.assertRaises(ValueError):
+                        batch.crypt_keys(block, matrix, False, 6)
+                    continue
+                for decrypt in (False, True):
+                    result = batch.crypt_keys(block, matrix, decrypt, 6, legacy_growth)
+                    for row, key in zip(result, keys):
+                        self.assertEqual(row.tobytes(), crypt_block_bytes(
+                            block, key, decrypt, 6, legacy_growth=legacy_growth))
+
+    def test_shape(self):
+        with self.assertRaises(ValueError):
+            batch.crypt_blocks(batch.np.zeros(16, dtype=batch.np.uint8), b'k', False, 1)
+        with self.assertRaises(ValueError):
+            batch.crypt_keys(bytes(16), batch.np.zeros(4, dtype=batch.np.uint8), False, 1)
+
+class PackageTest(unittest.TestCase):
+    """Ядро и консольные модули загружаются без Qt"""
+
+    def test_no_qt(self):
+        code = ("import sys, feistel, main, batch, bench, mapped, modes, parallel, stream; "
+                "sys.exit(any(name.startswith('PyQt') for name in sys.modules))")
+        subprocess.run([sys.executable, '-c', code], check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    def test_main_reexports(self):
+        import main
+        self.assertIs(main.crypt_block_bytes, crypt_block_bytes)
+
+class BenchTest(unittest.TestCase):
+    """Замеры и поиск регрессий в bench.py"""
+
+    def test_run(self):
+        results = bench.run_benchmarks((16,), (4,), (2,), ['bytes'], min_time=0, repeat=1)
+        self.assertEqual({entry['name'] for entry in results},
+                         {'keys_gen', 'f', 'crypt_round', 'crypt_block'})
+        self.assertEqual(bench.compare(results, results, 0.25), [])
+
+    def test_compare(self):
+        old = [bench.record('f', {'block_size': 16}, 8, 10, 1.0),
+               bench.record('f', {'block_size': 32}, 16, 10, 1.0)]
+        new = [bench.record('f', {'block_size': 16}, 8, 20, 1.2),
+               bench.record('f', {'block_size': 32}, 16, 20, 1.5),
+               bench.record('f', {'block_size': 64}, 32, 20, 9.0)]
+        regressions = bench.compare(new, old, 0.25)
+        self.assertEqual([(entry['block_size'], ratio) for entry, ratio in regressions],
+                         [(32, 1.5)])
+
+    def test_import(self):
+        # Замер не зависит от текущего каталога
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                entry = bench.measure_import(repeat=1)
+            finally:
+                os.chdir(cwd)
+        self.assertIsNotNone(entry['seconds_per_call'])
+        self.assertFalse(entry['qt_loaded'])
+        # Запись без времени не сравнивается
+        missing = dict(entry, seconds_per_call=None)
+        self.assertEqual(bench.compare([missing], [entry], 0.25), [])
+        self.assertEqual(bench.compare([entry], [missing], 0.25), [])
+
+    def test_parallel(self):
+        results = bench.measure_parallel(4096, (1, 2), repeat=1)
+        self.assertEqual([entry['workers'] for entry in results], [1, 2])
+        self.assertEqual(results[0]['speedup'], 1.0)
+        # Ускорение не входит в ключ сравнения с предыдущим запуском
+        changed = dict(results[1], speedup=0.1)
+        self.assertEqual(bench.result_key(changed), bench.result_key(results[1]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,519 @@
+"""
+Тесты логики графического интерфейса, не требующие отображения окна.
+
+Qt запускается с платформой offscreen, поэтому тесты выполняются и без
+дисплея.
+
+Запуск:
+    python -m unittest test_gui
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+try:
+    from PyQt6.QtCore import QPointF, QRectF, Qt
+    from PyQt6.QtGui import qRgb
+    from PyQt6.QtWidgets import QApplication, QGraphicsScene
+    import gui
+except ImportError:  # PyQt6 - необязательная зависимость для тестов ядра
+    gui = None
+
+from feistel import RoundTrace, crypt_block_bytes, keys_gen_bytes
+
+# Приложение Qt должно существовать, пока живут виджеты и сцены тестов
+app = None
+
+def setUpModule():
+    global app
+    if gui is not None:
+        app = QApplication.instance() or QApplication([])
+
+def run_worker(worker):
+    """Выполняет CryptWorker в текущем потоке и возвращает (сигнал, данные, прогресс)"""
+    events = []
+    progress = []
+    worker.progress.connect(lambda done, total: progress.append((done, total)))
+    worker.finished.connect(lambda payload: events.append(('finished', payload)))
+    worker.failed.connect(lambda message: events.append(('failed', message)))
+    worker.cancelled.connect(lambda: events.append(('cancelled', None)))
+    worker.run()
+    return events[0] + (progress,)
+
+def run_window(window, decrypt=False, timeout=10):
+    """Запускает вычисление в окне и обрабатывает события, пока оно не завершится"""
+    window.process_data(decrypt)
+    deadline = time.monotonic() + timeout
+    while window.worker is not None:
+        if time.monotonic() > deadline:
+            raise TimeoutError("Вычисление не завершилось")
+        app.processEvents()
+    return window.result_block
+
+@unittest.skipIf(gui is None, "PyQt6 не установлен")
+class VisualizerTest(unittest.TestCase):
+    """Состояния визуализации совпадают с ядром"""
+
+    block = b'Feistel network!'
+    key = b'nezachet'
+
+    def test_states(self):
+        for decrypt in (False, True):
+            visualizer = gui.FeistelVisualizer(self.block, self.key, 6, decrypt)
+            trace = RoundTrace()
+            result = crypt_block_bytes(self.block, self.key, decrypt, 6, observer=trace)
+            self.assertEqual([state for _, state, _ in visualizer.states],
+                             [self.block] + trace.states + [result])
+            visualizer.prepare()
+            self.assertEqual(len(visualizer.texts), len(visualizer.states))
+
+    def test_round_keys(self):
+        # Ключ раунда показывается без отбрасывания нулевых байтов и без свертки
+        for key in (b'ab\x00\x00', b'a much longer key than half a block'):
+            visualizer = gui.FeistelVisualizer(self.block, key, 3)
+            self.assertEqual([round_key for _, _, round_key in visualizer.states[1:-1]],
+                             list(keys_gen_bytes(key, False, 3)))
+
+    def test_text_preview(self):
+        format_data = gui.FeistelBlockItem.format_data
+        self.assertEqual(format_data(b'ab'), "ab\n61 62")
+        limit = gui.BLOCK_PREVIEW_BYTES
+        text = format_data(memoryview(b'x' * (limit + 1000)))
+        # Длинная половина блока показывается только началом
+        self.assertEqual(text, f"{'x' * limit}…\n{' '.join(['78'] * limit)} … "
+                               f"({limit + 1000} байт)")
+        visualizer = gui.FeistelVisualizer(bytes(1 << 16), self.key, 2)
+        visualizer.prepare()
+        self.assertLess(max(len(left) for left, _ in visualizer.texts), 5 * limit)
+
+    def test_virtual_rounds(self):
+        visualizer = gui.FeistelVisualizer(self.block, self.key, 500)
+        scene = QGraphicsScene()
+        view = gui.ZoomableGraphicsView(scene)
+        view.resize(800, 600)
+        visualizer.attach(scene, view)
+        step = visualizer.ROUND_STEP
+        top = visualizer.round_top(100)
+        rect = QRectF(0, top + 1, 800, 3 * step - 2)
+        self.assertEqual(visualizer.rounds_in_rect(rect), range(100, 103))
+        visualizer.update_visible(rect)
+        self.assertEqual(sorted(visualizer.visible_rounds), [100, 101, 102])
+        # Сильно уменьшенный вид создает не больше MAX_VISIBLE_ROUNDS раундов
+        visualizer.update_visible(QRectF(0, 0, 800, visualizer.round_top(501)))
+        self.assertEqual(len(visualizer.visible_rounds), visualizer.MAX_VISIBLE_ROUNDS)
+        visualizer.detach()
+        self.assertEqual(visualizer.visible_rounds, {})
+
+@unittest.skipIf(gui is None, "PyQt6 не установлен")
+class HeatmapTest(unittest.TestCase):
+    """Тепловая карта байтов и изменений между раундами"""
+
+    def test_gradient(self):
+        colors = gui.gradient([(0, 0, 0), (100, 200, 250)], 3)
+        self.assertEqual(colors, [qRgb(0, 0, 0), qRgb(50, 100, 125), qRgb(100, 200, 250)])
+        self.assertEqual(len(gui.VALUE_PALETTE), 256)
+        self.assertEqual(len(gui.DELTA_PALETTE), 9)
+
+    def test_state_heatmap(self):
+        block = b'Feistel network!'
+        visualizer = gui.FeistelVisualizer(block, b'nezachet', 3)
+        self.assertIsNone(visualizer.state_heatmap(1))
+        visualizer.render_mode = gui.RENDER_VALUE
+        state = visualizer.states[2][1]
+        self.assertEqual(visualizer.state_heatmap(2), (state[:8], state[8:], gui.VALUE_PALETTE))
+        visualizer.render_mode = gui.RENDER_DELTA
+        previous = visualizer.states[1][1]
+        left, right, palette = visualizer.state_heatmap(2)
+        self.assertEqual(list(left + right),
+                         [bin(a ^ b).count('1') for a, b in zip(state, previous)])
+        self.assertIs(palette, gui.DELTA_PALETTE)
+        # У начального блока нет предыдущего состояния
+        self.assertEqual(visualizer.state_heatmap(0)[0], bytes(8))
+
+    def test_index_at(self):
+        item = gui.ByteHeatmapItem(bytes(10), bytes(10), gui.VALUE_PALETTE,
+                                   QRectF(0, 0, 40, 30))
+        self.assertEqual((item.columns, item.rows), (4, 3))
+        self.assertEqual(item.index_at(QPointF(15, 12)), 5)
+        self.assertIsNone(item.index_at(QPointF(35, 25)))
+        self.assertIsNone(item.index_at(QPointF(-1, 5)))
+
+@unittest.skipIf(gui is None, "PyQt6 не установлен")
+class HexViewerModelTest(unittest.TestCase):
+    """Строки HEX-просмотрщика форматируются по запросу"""
+
+    def row(self, model, row):
+        return [model.data(model.index(row, column)) for column in range(model.columnCount())]
+
+    def test_rows(self):
+        data = bytes(range(0x1E, 0x1E + 20)) + b'\x7f\xff'
+        model = gui.HexViewerModel(data)
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.columnCount(), 3)
+        self.assertEqual(self.row(model, 0), [
+            '00000000',
+            '1e 1f 20 21 22 23 24 25 26 27 28 29 2a 2b 2c 2d',
+            '.. !"#$%&\'()*+,-',
+        ])
+        # Неполная последняя строка и непечатаемые байты
+        self.assertEqual(self.row(model, 1), ['00000010', '2e 2f 30 31 7f ff', './01..'])
+        self.assertIsNone(model.data(model.index(0, 1), Qt.ItemDataRole.ToolTipRole))
+        self.assertEqual(model.headerData(2, Qt.Orientation.Horizontal), 'ASCII')
+
+    def test_set_buffer(self):
+        model = gui.HexViewerModel()
+        self.assertEqual(model.rowCount(), 0)
+        model.set_buffer(bytearray(33))
+        self.assertEqual(model.rowCount(), 3)
+        self.assertEqual(self.row(model, 2), ['00000020', '00', '.'])
+
+@unittest.skipIf(gui is None, "PyQt6 не установлен")
+class FileInputTest(unittest.TestCase):
+    """Файл отображается в память, передается в ядро, а результат сохраняется"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.window = gui.FeistelNetworkGUI()
+        self.addCleanup(self.window.close)
+        self.window.key_input.setText('nezachet')
+        self.window.rounds_input.setValue(4)
+
+    def path(self, name, data=None):
+        path = os.path.join(self.tmp.name, name)
+        if data is not None:
+            gui.save_buffer(path, data)
+        return path
+
+    def test_map_file(self):
+        self.assertEqual(bytes(gui.map_file(self.path('data', b'0123456789'))), b'0123456789')
+        self.assertEqual(gui.map_file(self.path('empty', b'')), b'')
+
+    def test_open_file(self):
+        data = bytes(range(256)) * 40
+        self.window.open_file(self.path('data', data))
+        self.assertEqual(bytes(self.window.input_block()), data)
+        self.assertTrue(self.window.text_input.isReadOnly())
+        self.assertEqual(run_window(self.window),
+                         crypt_block_bytes(data, b'nezachet', False, 4, 'int'))
+        self.window.close_file()
+        self.assertIsNone(self.window.input_data)
+        self.assertFalse(self.window.text_input.isReadOnly())
+
+    def test_odd_file(self):
+        # Файл нечетной длины дополняется нулевым байтом, как текст
+        self.window.open_file(self.path('data', b'abc'))
+        self.assertEqual(self.window.input_block(), b'abc\x00')
+
+    def test_save_result(self):
+        self.window.text_input.setPlainText('Feistel network!')
+        result = run_window(self.window)
+        path = self.path('result')
+        gui.save_buffer(path, result)
+        self.window.open_file(path)
+        self.assertEqual(bytes(run_window(self.window, True)), b'Feistel network!')
+
+    def test_save_over_input(self):
+        # Кэши хранят копию блока, а не отображение файла, перезаписанного результатом
+        data = bytes(range(256)) * 4
+        path = self.path('data', data)
+        self.window.open_file(path)
+        gui.save_buffer(path, run_window(self.window))
+        self.assertEqual(bytes(run_window(self.window, True)), data)
+        # Повторное дешифрование берется из кэша результатов
+        self.assertEqual(bytes(run_window(self.window, True)), data)
+
+    def test_truncated_input(self):
+        # После усечения файла сохраненные состояния не обращаются к отображению
+        data = bytes(range(256)) * 4
+        path = self.path('data', data)
+        self.window.open_file(path)
+        result = bytes(run_window(self.window))
+        self.window.close_file()
+        gui.save_buffer(path, b'')
+        self.window.input_format_input.setCurrentIndex(
+            self.window.input_format_input.findData(gui.INPUT_HEX))
+        self.window.text_input.setPlainText(result.hex())
+        self.assertEqual(bytes(run_window(self.window, True)), data)
+
+    def test_close(self):
+        self.window.text_input.setPlainText('Feistel network!')
+        run_window(self.window)
+        visualizer = self.window.visualizer
+        self.window.close()
+        self.assertIsNone(self.window.visualizer)
+        self.assertIsNone(visualizer.view)
+        self.window.view.visible_rect_changed.emit(QRectF(0, 0, 100, 100))
+
+@unittest.skipIf(gui is None, "PyQt6 не установлен")
+class DecodeInputTest(unittest.TestCase):
+    """Разбор текста, HEX и Base64 из поля ввода"""
+
+    def test_formats(self):
+        self.assertEqual(gui.decode_input('Фейстель', gui.INPUT_TEXT), 'Фейстель'.encode('utf-8'))
+        self.assertEqual(gui.decode_input('00 ff\n4A', gui.INPUT_HEX), b'\x00\xffJ')
+        self.assertEqual(gui.decode_input('AP9K\nAA==', gui.INPUT_BASE64), b'\x00\xffJ\x00')
+        self.assertEqual(gui.decode_input('', gui.INPUT_HEX), b'')
+
+    def test_errors(self):
+        for text, input_format in (('0g', gui.INPUT_HEX), ('abc', gui.INPUT_HEX),
+                                   ('AP9', gui.INPUT_BASE64), ('Фе', gui.INPUT_BASE64),
+                                   ('text', 'utf-16')):
+            with self.subTest(text=text, input_format=input_format):
+                with self.assertRaises(ValueError):
+                    gui.decode_input(text, input_format)
+
+    def test_window(self):
+        window = gui.FeistelNetworkGUI()
+        self.addCleanup(window.close)
+        window.key_input.setText('nezachet')
+        window.input_format_input.setCurrentIndex(
+            window.input_format_input.findData(gui.INPUT_HEX))
+        window.text_input.setPlainText('zz')
+        window.process_data()
+        self.assertIsNone(window.worker)
+        self.assertIn("HEX", window.result_label.text())
+        window.text_input.setPlainText('0102030405')
+        # Блок нечетной длины дополняется нулевым байтом
+        self.assertEqual(window.input_block(), b'\x01\x02\x03\x04\x05\x00')
+
+class FakeCache:
+    """Кэш для CacheBudget, запоминающий вытесненные ключи"""
+
+    def __init__(self):
+        self.evicted = []
+
+    def evict(self, key):
+        self.evicted.append(key)
+
+@unittest.skipIf(gui is None, "PyQt6 не установлен")
+class CacheBudgetTest(unittest.TestCase):
+    """Общий бюджет вытесняет давно не использованные записи любого кэша"""
+
+    def test_charge(self):
+        budget = gui.CacheBudget(10)
+        first, second = FakeCache(), FakeCache()
+        self.assertTrue(budget.charge(first, 'a', 4))
+        self.assertTrue(budget.charge(second, 'b', 4))
+        budget.touch(first, 'a')
+        self.assertTrue(budget.charge(second, 'c', 4))
+        # Вытесняется 'b': запись 'a' использовалась позже
+        self.assertEqual((first.evicted, second.evicted), ([], ['b']))
+        self.assertEqual(budget.size, 8)
+        # Повторный учет записи заменяет ее размер
+        self.assertTrue(budget.charge(first, 'a', 6))
+        self.assertEqual(budget.size, 10)
+        self.assertEqual(second.evicted, ['b'])
+
+    def test_oversized(self):
+        budget = gui.CacheBudget(10)
+        cache = FakeCache()
+        budget.charge(cache, 'a', 4)
+        self.assertFalse(budget.charge(cache, 'a', 11))
+        # Прежний размер записи больше не учитывается, остальные не вытесняются
+        self.assertEqual(budget.size, 0)
+        self.assertEqual(cache.evicted, [])
+
+    def test_release(self):
+        budget = gui.CacheBudget(10)
+        cache = FakeCache()
+        budget.charge(cache, 'a', 4)
+        budget.release(cache, 'a')
+        budget.release(cache, 'missing')
+        budget.touch(cache, 'missing')
+        self.assertEqual((budget.size, budget.entries, cache.evicted), (0, {}, []))
+
+@unittest.skipIf(gui is None, "PyQt6 не установлен")
+class RoundStateCacheTest(unittest.TestCase):
+    """Состояния раундов берутся из кэша и совпадают с вычисленными заново"""
+
+    block = b'Feistel network!'
+    key = b'nezachet'
+
+    def setUp(self):
+        self.cache = gui.RoundStateCache(gui.CacheBudget())
+        self.computed = []
+
+    def observer(self, index, state, round_key):
+        self.computed.append(index)
+
+    def assertTrace(self, block, decrypt, rounds):
+        """Сравнивает trace кэша с crypt_block_bytes и возвращает номера вычисленных раундов"""
+        self.computed = []
+        trace, result = self.cache.trace(block, self.key, rounds, decrypt, self.observer)
+        expected = RoundTrace()
+        self.assertEqual(result, crypt_block_bytes(block, self.key, decrypt, rounds,
+                                                   observer=expected))
+        self.assertEqual(trace.states, expected.states)
+        self.assertEqual(trace.round_keys, expected.round_keys)
+        return self.computed
+
+    def test_encrypt(self):
+        self.assertEqual(self.assertTrace(self.block, False, 5), [0, 1, 2, 3, 4])
+        # Больше раундов - досчитываются только недостающие, меньше - префикс
+        self.assertEqual(self.assertTrace(self.block, False, 8), [5, 6, 7])
+        self.assertEqual(self.assertTrace(self.block, False, 3), [])
+        self.assertEqual(self.assertTrace(self.block, False, 0), [])
+
+    def test_decrypt(self):
+        encrypted = crypt_block_bytes(self.block, self.key, False, 6)
+        self.assertEqual(self.assertTrace(encrypted, True, 6), list(range(6)))
+        self.assertTrace(self.block, False, 6)
+        # Шифротекст блока из кэша дешифруется без вычисления раундов
+        self.assertEqual(self.assertTrace(encrypted, True, 6), [])
+        self.assertEqual(self.assertTrace(encrypted, True, 5), list(range(5)))
+        self.assertEqual(self.assertTrace(encrypted, True, 0), [])
+
+    def test_odd_block(self):
+        with self.assertRaises(ValueError):
+            self.cache.trace(b'odd', self.key, 2, False)
+
+    def test_budget(self):
+        blocks = [bytes([i]) * 16 for i in range(3)]
+        self.cache.trace(blocks[0], self.key, 4, False)
+        size = self.cache.budget.size
+        self.cache.budget.limit = 2 * size
+        for block in blocks[1:]:
+            self.cache.trace(block, self.key, 4, False)
+        # Давно не использованная цепочка вытесняется при превышении бюджета
+        self.assertEqual(len(self.cache.chains), 2)
+        self.assertEqual(self.cache.budget.size, 2 * size)
+        self.assertEqual(self.assertTrace(blocks[2], False, 4), [])
+        self.assertEqual(self.assertTrace(blocks[0], False, 4), [0, 1, 2, 3])
+        self.assertEqual(sorted(bytes(chain.block) for chain in self.cache.chains.values()),
+                         [blocks[0], blocks[2]])
+
+    def test_oversized(self):
+        self.cache.budget.limit = 1
+        # Цепочка больше бюджета не сохраняется, но результат верен
+        self.assertEqual(self.assertTrace(self.block, False, 4), [0, 1, 2, 3])
+        self.assertEqual(self.cache.chains, {})
+        self.assertEqual(self.cache.budget.size, 0)
+
+    def test_budget_while_tracing(self):
+        # Цепочка учитывается в бюджете после каждого раунда, а не в конце
+        self.cache.trace(self.block, self.key, 4, False)
+        limit = self.cache.budget.size
+        self.cache = gui.RoundStateCache(gui.CacheBudget(limit))
+        other = FakeCache()
+        self.cache.budget.charge(other, 'old', limit // 2)
+        seen = []
+
+        def observer(index, state, round_key):
+            seen.append((self.cache.budget.size, len(other.evicted), len(self.cache.chains)))
+
+        trace, result = self.cache.trace(self.block, self.key, 8, False, observer)
+        self.assertEqual(result, crypt_block_bytes(self.block, self.key, False, 8))
+        self.assertEqual(len(trace.states), 8)
+        self.assertTrue(all(size <= limit for size, _, _ in seen))
+        # Старая запись вытесняется, пока цепочка растет, а цепочка больше
+        # бюджета перестает храниться сразу после его превышения
+        self.assertEqual(seen[3], (limit, 1, 1))
+        self.assertEqual(seen[4:], [(0, 1, 0)] * 4)
+        self.assertEqual(self.cache.chains, {})
+
+@unittest.skipIf(gui is None, "PyQt6 не установлен")
+class ResultCacheTest(unittest.TestCase):
+    """Повторное вычисление берется из кэша результатов в пределах бюджета"""
+
+    key = b'nezachet'
+
+    def payload(self, block):
+        return run_worker(gui.CryptWorker(block, self.key, 4, False))[1]
+
+    def test_worker(self):
+        cache = gui.ResultCache(gui.CacheBudget())
+        block = b'Feistel network!'
+        _, first, _ = run_worker(gui.CryptWorker(block, self.key, 4, False, cache=cache))
+        signal, second, progress = run_worker(
+            gui.CryptWorker(bytearray(block), self.key, 4, False, cache=cache))
+        self.assertEqual(signal, 'finished')
+        self.assertIs(second, first)
+        self.assertEqual(progress, [(4, 4)])
+        # Другой режим - другая запись
+        _, other, _ = run_worker(gui.CryptWorker(block, self.key, 4, True, cache=cache))
+        self.assertIsNot(other, first)
+
+    def size(self, payload):
+        return sys.getsizeof(payload[1]) + payload[2].nbytes()
+
+    def test_budget(self):
+        blocks = [bytes([i]) * 64 for i in range(3)]
+        payloads = [self.payload(block) for block in blocks]
+        size = self.size(payloads[0])
+        cache = gui.ResultCache(gui.CacheBudget(2 * size))
+        keys = [cache.make_key(block, self.key, 4, False) for block in blocks]
+        for cache_key, payload in zip(keys, payloads):
+            cache.put(cache_key, payload)
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertIs(cache.get(keys[1]), payloads[1])
+        self.assertIs(cache.get(keys[2]), payloads[2])
+        self.assertEqual(cache.budget.size, 2 * size)
+        # Запись больше бюджета не сохраняется
+        small = gui.ResultCache(gui.CacheBudget(size - 1))
+        small.put(keys[0], payloads[0])
+        self.assertIsNone(small.get(keys[0]))
+
+    def test_shared_budget(self):
+        block = bytes(64)
+        payload = self.payload(block)
+        budget = gui.CacheBudget()
+        states = gui.RoundStateCache(budget)
+        results = gui.ResultCache(budget)
+        states.trace(block, self.key, 4, False)
+        chain_size = budget.size
+        budget.limit = chain_size + self.size(payload) - 1
+        # Результат не помещается рядом с цепочкой: вытесняется цепочка
+        cache_key = results.make_key(block, self.key, 4, False)
+        results.put(cache_key, payload)
+        self.assertEqual(states.chains, {})
+        self.assertIs(results.get(cache_key), payload)
+        # И наоборот: новая цепочка вытесняет результат
+        budget.limit = self.size(payload) + chain_size - 1
+        states.trace(block, self.key, 4, False)
+        self.assertIsNone(results.get(cache_key))
+        self.assertEqual(len(states.chains), 1)
+        self.assertEqual(budget.size, chain_size)
+
+@unittest.skipIf(gui is None, "PyQt6 не установлен")
+class CryptWorkerTest(unittest.TestCase):
+    """Фоновое вычисление выдает результат, прогресс и поддерживает отмену"""
+
+    block = b'Feistel network!'
+    key = b'nezachet'
+
+    def setUp(self):
+        # Раунды из общего кэша состояний не вычисляются и не дают прогресса
+        cache = gui.FeistelVisualizer.state_cache
+        gui.FeistelVisualizer.state_cache = gui.RoundStateCache()
+        self.addCleanup(setattr, gui.FeistelVisualizer, 'state_cache', cache)
+
+    def test_finished(self):
+        signal, payload, progress = run_worker(gui.CryptWorker(self.block, self.key, 5, False))
+        self.assertEqual(signal, 'finished')
+        result_block, result_text, visualizer = payload
+        self.assertEqual(result_block, crypt_block_bytes(self.block, self.key, False, 5))
+        self.assertEqual(result_text, gui.format_result(result_block))
+        self.assertEqual(len(visualizer.states), 7)
+        self.assertEqual(sorted(set(progress)), [(i, 5) for i in range(1, 6)])
+        self.assertEqual(progress[-1], (5, 5))
+
+    def test_failed(self):
+        signal, message, _ = run_worker(gui.CryptWorker(b'odd', self.key, 5, False))
+        self.assertEqual(signal, 'failed')
+        self.assertTrue(message)
+
+    def test_cancelled(self):
+        worker = gui.CryptWorker(self.block, self.key, 5, False)
+        worker.progress.connect(lambda done, total: worker.cancel())
+        signal, _, progress = run_worker(worker)
+        self.assertEqual(signal, 'cancelled')
+        self.assertEqual(progress, [(1, 5)])
+
+if __name__ == '__main__':
+    unittest.main()